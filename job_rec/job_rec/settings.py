@@ -80,6 +80,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'job_recommendation.page_cache.jobs_version',
             ],
         },
     },
@@ -90,8 +91,15 @@ WSGI_APPLICATION = 'job_rec.wsgi.application'
 
 # Database
 # Use dj_database_url for deployment (Neon connection string)
+# Connections are kept open for DB_CONN_MAX_AGE seconds and checked before
+# reuse, so the web workers, the scrapers and the scheduler each hold a small
+# set of persistent connections instead of connecting per request or per run.
 DATABASES = {
-    'default': dj_database_url.config(default=os.environ.get('DATABASE_URL'))
+    'default': dj_database_url.config(
+        default=os.environ.get('DATABASE_URL'),
+        conn_max_age=int(os.environ.get('DB_CONN_MAX_AGE', '600')),
+        conn_health_checks=True,
+    )
 }
 
 
@@ -138,6 +146,108 @@ STATICFILES_DIRS = [BASE_DIR / "job_recommendation/static"]
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Load ML models when the WSGI app starts instead of on the first request
+# that needs them (see job_recommendation.model_registry)
+WARM_UP_MODELS = os.environ.get('WARM_UP_MODELS', 'False') == 'True'
+
+# Category classifier inference: 'torch' (fp32), 'quantized' (int8 linear layers)
+# or 'onnx'. Fast backends only serve after `manage.py check_classifier_backend`
+# has approved them. TORCH_NUM_THREADS caps intra-op threads (0 = torch default).
+CLASSIFIER_BACKEND = os.environ.get('CLASSIFIER_BACKEND', 'torch')
+TORCH_NUM_THREADS = int(os.environ.get('TORCH_NUM_THREADS', '0'))
+
+# recommend_category memoizes predictions per normalized text: an in-process
+# LRU of PREDICTION_CACHE_SIZE entries, each kept for PREDICTION_CACHE_TTL
+# seconds. PREDICTION_CACHE_SHARED also stores them in the default Django cache
+# so other workers can reuse them. Each process logs its hit/miss counters every
+# PREDICTION_CACHE_LOG_EVERY lookups (0 turns the log line off).
+PREDICTION_CACHE_SIZE = int(os.environ.get('PREDICTION_CACHE_SIZE', '1024'))
+PREDICTION_CACHE_TTL = int(os.environ.get('PREDICTION_CACHE_TTL', '3600'))
+PREDICTION_CACHE_SHARED = os.environ.get('PREDICTION_CACHE_SHARED', 'False') == 'True'
+PREDICTION_CACHE_LOG_EVERY = int(os.environ.get('PREDICTION_CACHE_LOG_EVERY', '1000'))
+
+# Default cache. 'file' (the default) is shared by every process on the host:
+# gunicorn workers, the scheduler and management commands. 'locmem' is
+# per-process and only suits a single development server. page_cache_meta
+# holds just the jobs data version and page cache counters (see page_cache.py),
+# apart from the default cache so culling page entries never evicts them.
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'file')
+if CACHE_BACKEND == 'locmem':
+    CACHES = {
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'page_cache_meta': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'page-cache-meta',
+        },
+    }
+else:
+    CACHE_DIR = os.environ.get('CACHE_DIR', str(BASE_DIR / 'cache'))
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': CACHE_DIR,
+            'OPTIONS': {'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', '5000'))},
+        },
+        'page_cache_meta': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.path.join(CACHE_DIR, 'meta'),
+        },
+    }
+
+# Per-category counts and newest jobs (home and category pages) are cached in
+# the default cache for CATEGORY_OVERVIEW_TTL seconds or until the jobs data
+# version changes. PAGE_CACHE_TTL does the same for whole job pages and their
+# template fragments (0 turns page caching off), see page_cache.py.
+CATEGORY_OVERVIEW_TTL = int(os.environ.get('CATEGORY_OVERVIEW_TTL', '900'))
+PAGE_CACHE_TTL = int(os.environ.get('PAGE_CACHE_TTL', '600'))
+
+# Scrapers run concurrently. SCRAPER_MAX_CONCURRENCY bounds the blocking
+# Selenium/parsing calls in flight across all sites (and the thread pool that
+# runs them), SCRAPER_SITE_CONCURRENCY the calls per site. A site still running
+# after SCRAPER_SITE_TIMEOUT seconds is cancelled.
+SCRAPER_MAX_CONCURRENCY = int(os.environ.get('SCRAPER_MAX_CONCURRENCY', '4'))
+SCRAPER_SITE_CONCURRENCY = int(os.environ.get('SCRAPER_SITE_CONCURRENCY', '2'))
+SCRAPER_SITE_TIMEOUT = int(os.environ.get('SCRAPER_SITE_TIMEOUT', '600'))
+
+# How scrapers fetch pages: 'http' (plain HTTP, Chrome only for pages whose
+# listings need JS), 'selenium' (always Chrome) or 'fixtures' (replay saved
+# HTML from SCRAPER_FIXTURE_DIR, see `manage.py replay_scraper_fixtures`).
+SCRAPER_FETCHER = os.environ.get('SCRAPER_FETCHER', 'http')
+SCRAPER_FIXTURE_DIR = os.environ.get('SCRAPER_FIXTURE_DIR', str(BASE_DIR))
+
+# Where scrapers keep state between runs, e.g. the hashed set of job URLs
+# they have already ingested per site
+SCRAPER_STATE_DIR = os.environ.get('SCRAPER_STATE_DIR', str(BASE_DIR / 'scraper_state'))
+
+# Conditional-request cache for scraper HTTP fetches (ETag/Last-Modified and
+# body hash per URL); pages that did not change are not parsed again
+SCRAPER_HTTP_CACHE = os.environ.get('SCRAPER_HTTP_CACHE', 'True') == 'True'
+SCRAPER_CACHE_DIR = os.environ.get('SCRAPER_CACHE_DIR', os.path.join(SCRAPER_STATE_DIR, 'http_cache'))
+SCRAPER_CACHE_MAX_BYTES = int(os.environ.get('SCRAPER_CACHE_MAX_BYTES', str(50 * 1024 * 1024)))
+
+# After scraping, fetch the detail page of each new job for its description,
+# with SCRAPER_DETAIL_WORKERS concurrent workers and at least
+# SCRAPER_HOST_INTERVAL seconds between requests to the same host
+SCRAPER_FETCH_DESCRIPTIONS = os.environ.get('SCRAPER_FETCH_DESCRIPTIONS', 'True') == 'True'
+SCRAPER_DETAIL_WORKERS = int(os.environ.get('SCRAPER_DETAIL_WORKERS', '8'))
+SCRAPER_HOST_INTERVAL = float(os.environ.get('SCRAPER_HOST_INTERVAL', '0.5'))
+
+# Chrome drivers shared by the scrapers when a page needs JS: at most
+# SCRAPER_BROWSERS at once, each replaced after SCRAPER_BROWSER_MAX_PAGES loads.
+# SCRAPER_DEBUG_DUMPS saves a screenshot and page source when a load fails.
+SCRAPER_BROWSERS = int(os.environ.get('SCRAPER_BROWSERS', '2'))
+SCRAPER_BROWSER_MAX_PAGES = int(os.environ.get('SCRAPER_BROWSER_MAX_PAGES', '50'))
+SCRAPER_DEBUG_DUMPS = os.environ.get('SCRAPER_DEBUG_DUMPS', 'False') == 'True'
+
+# `manage.py run_scheduler`: each site is scraped in its own window starting at
+# SCRAPER_SCHEDULE_START (Africa/Blantyre), SCRAPER_SCHEDULE_STAGGER_MINUTES
+# apart, and categorize/embed/match run at PIPELINE_SCHEDULE_TIME. Runs missed
+# by less than SCHEDULER_MISFIRE_GRACE seconds are caught up on start-up.
+SCRAPER_SCHEDULE_START = os.environ.get('SCRAPER_SCHEDULE_START', '06:00')
+SCRAPER_SCHEDULE_STAGGER_MINUTES = int(os.environ.get('SCRAPER_SCHEDULE_STAGGER_MINUTES', '20'))
+PIPELINE_SCHEDULE_TIME = os.environ.get('PIPELINE_SCHEDULE_TIME', '07:30')
+SCHEDULER_MISFIRE_GRACE = int(os.environ.get('SCHEDULER_MISFIRE_GRACE', '3600'))
+
 # Custom User Model
 AUTH_USER_MODEL = 'job_recommendation.User'
 
@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'job_rec.settings')
 
 application = get_wsgi_application()
+
+from django.conf import settings
+
+if settings.WARM_UP_MODELS:
+    from job_recommendation import model_registry
+    model_registry.warm_up()
@@ -1,8 +1,14 @@
 # job_app/admin.py
 
 from django.contrib import admin
-from .models import Job, User
+from .models import Job, PipelineRun, User
 
 admin.site.register(Job)
 admin.site.register(User)
 # admin.site.register(JobCategory)
+
+
+@admin.register(PipelineRun)
+class PipelineRunAdmin(admin.ModelAdmin):
+    list_display = ('stage', 'site', 'status', 'started_at', 'duration', 'items')
+    list_filter = ('stage', 'status', 'site')
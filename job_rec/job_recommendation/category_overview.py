@@ -0,0 +1,58 @@
+"""
+Per-category job counts and newest jobs for the home and category pages.
+
+One query computes both with window functions over jobs_cleaned: COUNT(*)
+and ROW_NUMBER() partitioned by category, keeping the TOP_K newest rows of
+each. The result is kept in the default Django cache for
+CATEGORY_OVERVIEW_TTL seconds under the jobs data version (see page_cache.py),
+so it is rebuilt as soon as the categorizer or post_job writes jobs_cleaned.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
+
+from job_recommendation.display import category_icon
+from job_recommendation.page_cache import data_version
+
+CACHE_KEY = 'category-overview'
+TOP_K = 6
+
+
+def build_category_overview(top_k=TOP_K):
+    """[{'name', 'icon', 'count', 'jobs'}] for every category, largest first."""
+    from job_recommendation.listing import card_queryset, decorate
+    from job_recommendation.models import JobCleaned
+
+    rows = (
+        card_queryset(JobCleaned.objects.all())
+        .annotate(
+            position=Window(
+                RowNumber(), partition_by=F('category'), order_by=[F('date_posted').desc(), F('id').desc()]
+            ),
+            category_count=Window(Count('id'), partition_by=F('category')),
+        )
+        .filter(position__lte=top_k)
+        .order_by('-category_count', 'category', 'position')
+    )
+    overview = []
+    for job in decorate(list(rows)):
+        if not overview or overview[-1]['name'] != job.category:
+            overview.append({
+                'name': job.category,
+                'icon': category_icon(job.category),
+                'count': job.category_count,
+                'jobs': [],
+            })
+        overview[-1]['jobs'].append(job)
+    return overview
+
+
+def get_category_overview():
+    """Cached build_category_overview()."""
+    key = f'{CACHE_KEY}:{data_version()}'
+    overview = cache.get(key)
+    if overview is None:
+        overview = build_category_overview()
+        cache.set(key, overview, settings.CATEGORY_OVERVIEW_TTL)
+    return overview
@@ -0,0 +1,127 @@
+"""
+Display attributes derived from a job's title, computed once when the job is
+written to jobs_cleaned (categorizer, post_job, `manage.py backfill_job_icons`)
+instead of on every page render.
+
+The icon is that of the first group in ICON_KEYWORDS with a keyword anywhere in
+the lower-cased title. All keywords are compiled into one regex, a trie of
+nested alternations inside a lookahead, so a single scan of the title finds
+the longest keyword starting at each position. Every shorter keyword starting
+there is a prefix of that one, so each keyword is ranked by the best group
+among its keyword prefixes, and the best rank over the scan is the group the
+old chain of `any(word in title ...)` checks would have picked.
+
+Categories have their own fixed icons (CATEGORY_ICONS).
+"""
+import re
+
+DEFAULT_ICON = 'fa-briefcase'
+
+CATEGORY_ICONS = {
+    "Agriculture & Environment": "fa-seedling",
+    "Health & Education": "fa-stethoscope",
+    "Business & Administration": "fa-briefcase",
+    "Technical & Engineering": "fa-cogs",
+    "IT & Innovation": "fa-laptop-code",
+    "Services & Informal Sector": "fa-tools",
+    "Government & NGOs": "fa-university",
+    "Creative & Media": "fa-paint-brush",
+    # Labels of the category classifier (model/job_data.csv)
+    "Agriculture": "fa-seedling",
+    "Construction": "fa-hard-hat",
+    "Customer Support": "fa-headset",
+    "Education": "fa-graduation-cap",
+    "Engineering": "fa-cogs",
+    "Finance": "fa-calculator",
+    "Healthcare": "fa-stethoscope",
+    "Hospitality": "fa-utensils",
+    "Human Resources": "fa-users",
+    "IT": "fa-laptop-code",
+    "Legal": "fa-balance-scale",
+    "Marketing": "fa-chart-line",
+    "Retail": "fa-shopping-cart",
+    "Sales": "fa-handshake",
+    "Transportation": "fa-truck",
+}
+
+# (icon, keywords), highest priority first
+ICON_KEYWORDS = [
+    # Technology/IT jobs
+    ('fa-laptop-code', ['developer', 'programmer', 'software', 'engineer', 'coding', 'web', 'app', 'mobile', 'frontend', 'backend', 'fullstack', 'devops', 'data', 'ai', 'machine learning']),
+    # Design/Creative jobs
+    ('fa-paint-brush', ['designer', 'design', 'creative', 'graphic', 'ui', 'ux', 'art', 'visual', 'illustrator', 'animator']),
+    # Marketing/Sales jobs
+    ('fa-chart-line', ['marketing', 'sales', 'business', 'account', 'manager', 'executive', 'representative', 'consultant']),
+    # Healthcare jobs
+    ('fa-stethoscope', ['nurse', 'doctor', 'medical', 'health', 'care', 'therapist', 'physician', 'dentist', 'pharmacist']),
+    # Education jobs
+    ('fa-graduation-cap', ['teacher', 'professor', 'instructor', 'educator', 'tutor', 'lecturer', 'academic']),
+    # Finance/Accounting jobs
+    ('fa-calculator', ['accountant', 'finance', 'financial', 'banking', 'auditor', 'bookkeeper', 'analyst']),
+    # Customer Service jobs
+    ('fa-headset', ['customer', 'support', 'service', 'representative', 'assistant', 'help', 'care']),
+    # Engineering/Technical jobs
+    ('fa-cogs', ['engineer', 'technical', 'technician', 'mechanic', 'electrician', 'plumber', 'construction']),
+    # Administrative jobs
+    ('fa-briefcase', ['admin', 'administrative', 'secretary', 'assistant', 'coordinator', 'clerk']),
+    # Legal jobs
+    ('fa-balance-scale', ['lawyer', 'attorney', 'legal', 'paralegal', 'law']),
+    # Science/Research jobs
+    ('fa-flask', ['scientist', 'researcher', 'analyst', 'laboratory', 'research', 'phd']),
+    # Transportation/Logistics jobs
+    ('fa-truck', ['driver', 'delivery', 'logistics', 'transport', 'shipping', 'warehouse']),
+    # Hospitality/Tourism jobs
+    ('fa-utensils', ['hotel', 'restaurant', 'chef', 'cook', 'waiter', 'tourism', 'travel']),
+    # Media/Entertainment jobs
+    ('fa-microphone', ['journalist', 'reporter', 'writer', 'editor', 'media', 'entertainment', 'actor', 'musician']),
+    # Government/Public Service jobs
+    ('fa-university', ['government', 'public', 'officer', 'policy', 'civil', 'service']),
+    # Agriculture/Environment jobs
+    ('fa-seedling', ['agriculture', 'farming', 'environment', 'conservation', 'forestry']),
+]
+
+
+def _trie_pattern(node):
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    # '' marks the end of a keyword: the rest is optional, longest match first
+    return f'(?:{pattern})?' if '' in node else pattern
+
+
+def _compile(table):
+    priority = {}
+    for rank, (_, keywords) in enumerate(table):
+        for keyword in keywords:
+            priority.setdefault(keyword, rank)
+    trie = {}
+    for keyword in priority:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    # A match of keyword means each keyword that is a prefix of it matched too
+    best = {
+        keyword: min(rank for other, rank in priority.items() if keyword.startswith(other))
+        for keyword in priority
+    }
+    return re.compile(f'(?=({_trie_pattern(trie)}))'), best
+
+
+_PATTERN, _PRIORITY = _compile(ICON_KEYWORDS)
+
+
+def job_icon(title):
+    """Font Awesome icon class for a job title."""
+    best = len(ICON_KEYWORDS)
+    for match in _PATTERN.finditer((title or '').lower()):
+        best = min(best, _PRIORITY[match.group(1)])
+        if best == 0:
+            break
+    return ICON_KEYWORDS[best][0] if best < len(ICON_KEYWORDS) else DEFAULT_ICON
+
+
+def category_icon(category):
+    """Font Awesome icon class for a job category."""
+    return CATEGORY_ICONS.get(category, DEFAULT_ICON)
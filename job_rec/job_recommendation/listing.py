@@ -0,0 +1,102 @@
+"""
+Job listing pages that cost O(page size), not O(table).
+
+Listing querysets load only the fields a job card shows (no description or
+search vector), decorations are set for the jobs on the page only, and
+browsing uses keyset pagination on (date_posted, id): a page is "the next 6
+jobs older than the last one shown", which the jobs_cleaned_listing_idx index
+answers without counting or skipping rows.
+"""
+from datetime import date
+
+from django.db.models import Q
+
+from job_recommendation.display import job_icon
+
+PER_PAGE = 6
+CARD_FIELDS = ('id', 'title', 'company', 'location', 'job_type', 'date_posted', 'category', 'icon')
+
+
+def card_queryset(jobs):
+    """jobs with only the fields job cards render."""
+    return jobs.only(*CARD_FIELDS)
+
+
+def decorate(jobs):
+    """Set icon_class on each job (a list or page, already fetched) and return it."""
+    for job in jobs:
+        # Rows written before the icon column existed until backfill_job_icons runs
+        job.icon_class = job.icon or job_icon(job.title)
+    return jobs
+
+
+def newest_jobs(jobs, limit):
+    """The limit newest jobs of the queryset, decorated."""
+    return decorate(list(card_queryset(jobs).order_by('-date_posted', '-id')[:limit]))
+
+
+def encode_cursor(job):
+    return f'{job.date_posted.isoformat()}.{job.id}'
+
+
+def decode_cursor(cursor):
+    """(date_posted, id) from a cursor, or None if it is missing or malformed."""
+    try:
+        day, job_id = cursor.split('.')
+        return date.fromisoformat(day), int(job_id)
+    except (AttributeError, ValueError):
+        return None
+
+
+class KeysetPage:
+    """One page of jobs, newest first, with cursors to the pages either side."""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+def keyset_page(jobs, after=None, before=None, per_page=PER_PAGE):
+    """
+    The page of jobs (a JobCleaned queryset) following the cursor after, or
+    preceding the cursor before; the first page when neither is valid.
+    """
+    jobs = card_queryset(jobs)
+    after, before = decode_cursor(after), decode_cursor(before)
+    if before:
+        day, job_id = before
+        rows = list(
+            jobs.filter(Q(date_posted__gt=day) | Q(date_posted=day, id__gt=job_id))
+            .order_by('date_posted', 'id')[:per_page + 1]
+        )
+        has_previous = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+        has_next = True
+    else:
+        if after:
+            day, job_id = after
+            jobs = jobs.filter(Q(date_posted__lt=day) | Q(date_posted=day, id__lt=job_id))
+        rows = list(jobs.order_by('-date_posted', '-id')[:per_page + 1])
+        has_next = len(rows) > per_page
+        rows = rows[:per_page]
+        has_previous = after is not None
+    if not rows:
+        return KeysetPage([])
+    return KeysetPage(
+        decorate(rows),
+        next_cursor=encode_cursor(rows[-1]) if has_next else None,
+        previous_cursor=encode_cursor(rows[0]) if has_previous else None,
+    )
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from job_recommendation.display import job_icon
+from job_recommendation.models import JobCleaned
+from job_recommendation.page_cache import bump_data_version
+
+
+class Command(BaseCommand):
+    help = 'Computes the stored icon for jobs_cleaned rows written before it existed (or all rows with --all).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Recompute every row, e.g. after ICON_KEYWORDS changed.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        jobs = JobCleaned.objects.only('id', 'title', 'icon').order_by('id')
+        if not options['all']:
+            jobs = jobs.filter(icon='')
+        changed, updated = [], 0
+        for job in jobs.iterator(chunk_size=options['batch_size']):
+            icon = job_icon(job.title)
+            if icon != job.icon:
+                job.icon = icon
+                changed.append(job)
+            if len(changed) >= options['batch_size']:
+                updated += JobCleaned.objects.bulk_update(changed, ['icon'])
+                changed = []
+        if changed:
+            updated += JobCleaned.objects.bulk_update(changed, ['icon'])
+        if updated:
+            bump_data_version()
+        self.stdout.write(self.style.SUCCESS(f'Updated icons for {updated} jobs.'))
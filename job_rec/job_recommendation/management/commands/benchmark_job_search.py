@@ -0,0 +1,93 @@
+import csv
+import os
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+
+from job_recommendation.models import JobCleaned
+from job_recommendation.search import search_jobs
+
+DEFAULT_CSV = os.path.join(os.path.dirname(__file__), '..', '..', 'data_jobs.csv')
+DEFAULT_QUERIES = ['finance', 'accountant', 'data analyst', 'nurse lilongwe', 'progr', 'project manager', 'volunteer']
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _load_corpus(path, rows):
+    """Insert rows jobs_cleaned rows copied from the CSV (repeated as needed)."""
+    with open(path, newline='', encoding='utf-8') as f:
+        records = list(csv.DictReader(f))
+    if not records:
+        raise CommandError(f'No rows in {path}')
+
+    def text(record, field, max_length=None):
+        value = record.get(field) or ''
+        value = '' if value == 'NULL' else value
+        return value[:max_length] if max_length else value
+
+    batch = []
+    for i in range(rows):
+        record = records[i % len(records)]
+        try:
+            date_posted = datetime.strptime(record['date_posted'], '%m/%d/%Y').date()
+        except ValueError:
+            date_posted = datetime(2025, 1, 1).date()
+        batch.append(JobCleaned(
+            title=text(record, 'title', 255), company=text(record, 'company', 255),
+            location=text(record, 'location', 100), job_type=text(record, 'job_type', 50),
+            date_posted=date_posted, url=f"{record['url']}#{i}", source=text(record, 'source', 100),
+            description=text(record, 'description'), category=text(record, 'category', 100) or 'other',
+        ))
+    JobCleaned.objects.bulk_create(batch, batch_size=1000)
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares the full-text job search with the old title/company/description icontains filter. '
+        'Timings are for the first page of job_list (6 jobs) and the total count. With --rows, that many '
+        'jobs from data_jobs.csv are loaded in a transaction that is rolled back afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=0, help='Load this many CSV jobs first (e.g. 24000).')
+        parser.add_argument('--csv', default=DEFAULT_CSV)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--query', action='append', help='Query to time (default: a fixed set).')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                if options['rows']:
+                    _load_corpus(options['csv'], options['rows'])
+                    with connection.cursor() as cursor:
+                        cursor.execute('ANALYZE jobs_cleaned')
+                self._run(options['query'] or DEFAULT_QUERIES, options['repeat'])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _time(self, jobs, repeat):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            page = list(jobs[:6])
+            count = jobs.count()
+        return (time.perf_counter() - started) / repeat, count, page
+
+    def _run(self, queries, repeat):
+        self.stdout.write(f'{JobCleaned.objects.count()} jobs, {repeat} runs per query')
+        for query in queries:
+            icontains = JobCleaned.objects.filter(
+                Q(title__icontains=query) | Q(company__icontains=query) | Q(description__icontains=query)
+            )
+            old, old_count, _ = self._time(icontains, repeat)
+            new, new_count, page = self._time(search_jobs(JobCleaned.objects.all(), query), repeat)
+            top = page[0].title if page else '-'
+            self.stdout.write(
+                f'{query!r:20} icontains {old * 1000:8.2f} ms ({old_count:5} hits)   '
+                f'full-text {new * 1000:8.2f} ms ({new_count:5} hits)   top: {top}'
+            )
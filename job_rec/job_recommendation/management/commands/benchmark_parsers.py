@@ -0,0 +1,51 @@
+import glob
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from job_recommendation.scraper.parser_specs import SITE_SPECS, available_backends, compile_spec
+
+
+class Command(BaseCommand):
+    help = (
+        'Times the listing-page extractors on saved HTML (e.g. the *_final_page_source.html dumps) '
+        'with every installed parser backend, and checks they extract the same jobs.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', nargs='?', default=settings.SCRAPER_FIXTURE_DIR)
+        parser.add_argument('--repeat', type=int, default=20, help='Parses per page and backend.')
+
+    def handle(self, *args, **options):
+        pages = []
+        for path in sorted(glob.glob(os.path.join(options['directory'], '*.html'))):
+            name = os.path.basename(path)
+            site = next((site for site in SITE_SPECS if name.startswith(site.split('.')[0])), None)
+            if site:
+                with open(path, encoding='utf-8') as f:
+                    pages.append((name, site, f.read()))
+        if not pages:
+            raise CommandError(f"No saved pages for {', '.join(SITE_SPECS)} in {options['directory']}")
+
+        backends = available_backends()
+        repeat = options['repeat']
+        self.stdout.write(f"{len(pages)} pages, backends: {', '.join(backends)}, {repeat} parses each")
+        for name, site, html in pages:
+            # The html.parser results, which the scrapers used to produce, are the reference
+            reference = None
+            for backend in sorted(backends, key=lambda backend: backend != 'html.parser'):
+                extractor = compile_spec(SITE_SPECS[site], backend)
+                started = time.perf_counter()
+                for _ in range(repeat):
+                    records = extractor.extract(html)
+                per_page = (time.perf_counter() - started) / repeat
+                per_posting = per_page / len(records) if records else 0
+                if reference is None:
+                    reference = records
+                same = 'same' if records == reference else 'DIFFERENT'
+                self.stdout.write(
+                    f"{name:45} {backend:12} {len(records):4} jobs  {per_page * 1000:8.2f} ms/page  "
+                    f"{per_posting * 1e6:8.1f} us/posting  {same}"
+                )
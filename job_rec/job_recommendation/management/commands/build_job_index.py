@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from job_recommendation.model2_reccomender.job_index import BACKENDS, INDEX_BACKEND, build_job_index
+
+
+class Command(BaseCommand):
+    help = 'Builds the job vector index from stored job embeddings and saves it to disk.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--backend', choices=sorted(BACKENDS), default=INDEX_BACKEND)
+        parser.add_argument('--lists', type=int, default=None, help='Number of IVF lists (default: sqrt of job count).')
+        parser.add_argument('--probe', type=int, default=8, help='IVF lists scanned per query.')
+
+    def handle(self, *args, **options):
+        backend = options['backend']
+        extra = {'n_lists': options['lists'], 'n_probe': options['probe']} if backend == 'ivf' else {}
+        index = build_job_index(backend=backend, **extra)
+        if not len(index):
+            self.stdout.write(self.style.WARNING('No job embeddings yet, no index was saved.'))
+            return
+        self.stdout.write(self.style.SUCCESS(f'Built {backend} index with {len(index)} jobs.'))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from job_recommendation.model.inference import BACKENDS, PARITY_TOLERANCE, check_parity
+
+
+class Command(BaseCommand):
+    help = 'Checks a fast classifier backend against the fp32 model and records whether it may serve.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('backend', choices=[b for b in BACKENDS if b != 'torch'])
+        parser.add_argument('--sample', type=int, default=1000, help='Rows of job_data.csv to evaluate.')
+        parser.add_argument('--tolerance', type=float, default=PARITY_TOLERANCE,
+                            help='Largest accuracy drop allowed against fp32.')
+
+    def handle(self, *args, **options):
+        result = check_parity(options['backend'], sample_size=options['sample'], tolerance=options['tolerance'])
+        self.stdout.write(
+            f"accuracy {result['accuracy']:.4f} vs fp32 {result['reference_accuracy']:.4f}, "
+            f"agreement {result['agreement']:.4f}, "
+            f"{result['seconds']:.2f}s vs {result['reference_seconds']:.2f}s on {result['sample_size']} rows"
+        )
+        if result['approved']:
+            self.stdout.write(self.style.SUCCESS(f"Backend '{options['backend']}' approved."))
+        else:
+            self.stdout.write(self.style.ERROR(f"Backend '{options['backend']}' rejected; torch will keep serving."))
@@ -0,0 +1,20 @@
+import asyncio
+
+from django.core.management.base import BaseCommand
+
+from job_recommendation.scraper.descriptions import enrich_descriptions, jobs_missing_descriptions
+
+
+class Command(BaseCommand):
+    help = 'Fetches detail pages for jobs stored without a description and saves the extracted text.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--source', help='Only jobs from this site, e.g. ntchito.com.')
+        parser.add_argument('--limit', type=int, default=None, help='At most this many jobs, newest first.')
+        parser.add_argument('--workers', type=int, default=None, help='Concurrent fetch workers.')
+
+    def handle(self, *args, **options):
+        jobs = jobs_missing_descriptions(source=options['source'], limit=options['limit'])
+        self.stdout.write(f'{len(jobs)} jobs without a description.')
+        updated = asyncio.run(enrich_descriptions(jobs, workers=options['workers']))
+        self.stdout.write(self.style.SUCCESS(f'Updated descriptions for {updated} jobs.'))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from job_recommendation import model_registry
+
+
+class Command(BaseCommand):
+    help = 'Loads the registered models in a fresh process and shows how long each one took (the cold-start cost).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('models', nargs='*', help=f"Models to load (default: all of {', '.join(model_registry.MODEL_LOADERS)}).")
+
+    def handle(self, *args, **options):
+        unknown = set(options['models']) - set(model_registry.MODEL_LOADERS)
+        if unknown:
+            raise CommandError(f"Unknown models: {', '.join(sorted(unknown))}")
+        names = options['models'] or list(model_registry.MODEL_LOADERS)
+        times = model_registry.warm_up(names)
+        for name in names:
+            self.stdout.write(f"{name:22} {times[name]:8.2f}s")
+        self.stdout.write(f"Total: {sum(times[name] for name in names):.2f}s")
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from job_recommendation import views  # noqa: F401 (registers the cached views)
+from job_recommendation.page_cache import data_version, reset_stats, stats
+
+
+class Command(BaseCommand):
+    help = 'Shows page cache hits, misses and hit ratio per view, shared by every process using the cache.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Zero the counters after showing them.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'Jobs data version: {data_version()}')
+        for view, counts in stats().items():
+            self.stdout.write(
+                f"{view:15} {counts['hits']:8} hits {counts['misses']:8} misses  {counts['hit_ratio']:6.1%}"
+            )
+        if options['reset']:
+            reset_stats()
+            self.stdout.write('Counters reset.')
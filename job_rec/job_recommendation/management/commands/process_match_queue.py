@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from job_recommendation.model2_reccomender.refresh_queue import process_batch
+
+
+class Command(BaseCommand):
+    help = 'Long-running worker that drains the match refresh queue in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument('--top-n', type=int, default=6)
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds to sleep when the queue is empty.')
+        parser.add_argument('--once', action='store_true', help='Drain the queue once and exit.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('Match refresh worker started.'))
+        while True:
+            try:
+                processed = process_batch(limit=options['batch_size'], top_n=options['top_n'])
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f'Match refresh batch failed: {e}'))
+                processed = 0
+            if processed:
+                self.stdout.write(f'Refreshed {processed} queued users.')
+                continue
+            if options['once']:
+                break
+            time.sleep(options['poll_interval'])
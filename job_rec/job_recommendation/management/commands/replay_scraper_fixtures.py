@@ -0,0 +1,34 @@
+import asyncio
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from job_recommendation.scraper.fetchers import FixtureFetcher
+from job_recommendation.scraper.run_scrapers import SCRAPERS
+
+
+class Command(BaseCommand):
+    help = (
+        'Runs the site scrapers against saved HTML instead of the live sites, without writing to the '
+        'database. Pages are read from <dir>/<fixture_name(url)> or, failing that, from the '
+        '<site>_final_page_source.html dumps earlier scraper runs left behind.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', nargs='?', default=settings.SCRAPER_FIXTURE_DIR)
+        parser.add_argument('--site', choices=sorted(SCRAPERS), action='append', help='Replay only these sites.')
+
+    def handle(self, *args, **options):
+        for site in options['site'] or SCRAPERS:
+            prefix = site.split('.')[0]
+            fetcher = FixtureFetcher(site, options['directory'], default=f'{prefix}_final_page_source.html')
+            started = time.perf_counter()
+            try:
+                jobs = asyncio.run(SCRAPERS[site](fetcher=fetcher, save=False))
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f'{site}: failed: {e}'))
+                continue
+            elapsed = time.perf_counter() - started
+            missing_urls = sum(1 for job in jobs if not job['url'])
+            self.stdout.write(f'{site}: {len(jobs)} jobs parsed ({missing_urls} without URL) in {elapsed:.2f}s')
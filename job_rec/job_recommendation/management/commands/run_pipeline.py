@@ -1,48 +1,48 @@
 from django.core.management.base import BaseCommand
-import asyncio
 
-# Import the functions you need directly
-from job_recommendation.scraper.run_scrapers import main as run_scrapers_main
-from job_recommendation.model.test_BERT3 import run_categorization_pipeline
-from job_recommendation.model2_reccomender.eish import batch_save_all_matches
+from job_recommendation.scheduler import process_jobs, scrape_sites_locked
+from job_recommendation.scraper.run_scrapers import SCRAPERS
+
 
 class Command(BaseCommand):
-    help = 'Runs the full job recommendation pipeline: scrape, categorize, match.'
+    help = (
+        'Runs the full job recommendation pipeline: scrape, categorize, embed, match. Each stage takes the '
+        'same lock as the scheduler, so a stage already running elsewhere is skipped, and every stage is '
+        'recorded in pipeline_runs.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full-categorization', action='store_true',
+            help='Reclassify every job instead of only new or changed ones.',
+        )
+
+    def report(self, run):
+        name = f'{run.stage} {run.site}'.strip()
+        if run.status == 'ok':
+            self.stdout.write(self.style.SUCCESS(f'{name}: done ({run.items} items).'))
+        elif run.status == 'skipped':
+            self.stdout.write(self.style.WARNING(f'{name}: skipped, another process holds its lock.'))
+        else:
+            self.stdout.write(self.style.ERROR(f'{name}: failed: {run.error}'))
 
     def handle(self, *args, **options):
         self.stdout.write(self.style.SUCCESS('Starting pipeline...'))
 
-        # 1. Run scrapers
-        self.stdout.write('Running scrapers...')
-        try:
-            awaitable = run_scrapers_main(run_scheduler=False)
-            if asyncio.iscoroutine(awaitable):
-                asyncio.run(awaitable)
-            else:
-                awaitable
-            self.stdout.write(self.style.SUCCESS('Scraping complete.'))
-        except Exception as e:
-            self.stdout.write(self.style.ERROR(f'Scraping failed: {e}'))
-            # Stop the pipeline if scraping fails
-            return
-
-        # 2. Categorize jobs (Now called directly)
-        self.stdout.write('Categorizing jobs...')
-        try:
-            run_categorization_pipeline()
-            self.stdout.write(self.style.SUCCESS('Categorization complete.'))
-        except Exception as e:
-            self.stdout.write(self.style.ERROR(f'Categorization failed: {e}'))
-            # Stop the pipeline if categorization fails
+        # 1. Scrape every site whose lock is free, concurrently; one failing site does not block the others
+        scrape_runs = scrape_sites_locked(list(SCRAPERS))
+        for run in scrape_runs:
+            self.report(run)
+        if not any(run.status == 'ok' for run in scrape_runs):
+            self.stdout.write(self.style.ERROR('No site was scraped, stopping.'))
             return
 
-        # 3. Run matching for all users
-        self.stdout.write('Matching users to jobs...')
-        try:
-            batch_save_all_matches(top_n=6)
-            self.stdout.write(self.style.SUCCESS('Matching complete.'))
-        except Exception as e:
-            self.stdout.write(self.style.ERROR(f'Matching failed: {e}'))
+        # 2. Categorize, embed and match, stopping at the first stage that does not succeed
+        runs = process_jobs(incremental=not options['full_categorization'])
+        for run in runs:
+            self.report(run)
+        if len(runs) < 3 or runs[-1].status != 'ok':
+            self.stdout.write(self.style.ERROR('Pipeline stopped early.'))
             return
 
-        self.stdout.write(self.style.SUCCESS('Pipeline finished successfully!'))
\ No newline at end of file
+        self.stdout.write(self.style.SUCCESS('Pipeline finished successfully!'))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from job_recommendation.scheduler import build_scheduler, process_jobs, scrape_site
+
+
+class Command(BaseCommand):
+    help = (
+        'Runs the daily pipeline on a schedule: one scrape window per site, then categorize, embed and match. '
+        'Stages never overlap across processes, and every run is recorded in pipeline_runs.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--now', action='store_true', help='Run every stage once, in order, and exit.')
+        parser.add_argument('--list', action='store_true', help='Show the schedule and exit.')
+
+    def handle(self, *args, **options):
+        scheduler = build_scheduler()
+        if options['list']:
+            for job in scheduler.get_jobs():
+                self.stdout.write(f'{job.id:35} {job.trigger}')
+            return
+        if options['now']:
+            for job in scheduler.get_jobs():
+                if job.func is scrape_site:
+                    scrape_site(*job.args)
+            process_jobs()
+            return
+        self.stdout.write(self.style.SUCCESS('Scheduler started.'))
+        try:
+            scheduler.start()
+        except (KeyboardInterrupt, SystemExit):
+            self.stdout.write('Scheduler shut down.')
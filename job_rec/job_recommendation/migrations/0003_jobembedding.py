@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_recommendation', '0002_alter_job_created_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobEmbedding',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='embedding', serialize=False, to='job_recommendation.jobcleaned')),
+                ('content_hash', models.CharField(max_length=64)),
+                ('vector', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'job_embeddings',
+                'managed': True,
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:12
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_recommendation', '0003_jobembedding'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchRefreshRequest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('user_id', models.IntegerField(unique=True)),
+                ('requested_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('claimed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'match_refresh_queue',
+                'managed': True,
+            },
+        ),
+    ]
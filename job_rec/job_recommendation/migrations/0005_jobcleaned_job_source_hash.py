@@ -0,0 +1,44 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_recommendation', '0004_matchrefreshrequest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobcleaned',
+            name='job',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='cleaned', to='job_recommendation.job'),
+        ),
+        migrations.AddField(
+            model_name='jobcleaned',
+            name='source_hash',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+        # Link existing categorized rows to their source job by URL and record
+        # the source hash, so the first incremental run does not reclassify them.
+        migrations.RunSQL(
+            sql="""
+                UPDATE jobs_cleaned c
+                SET job_id = m.job_id, source_hash = m.source_hash
+                FROM (
+                    SELECT DISTINCT ON (j.id)
+                        j.id AS job_id,
+                        c.id AS cleaned_id,
+                        md5(ROW(j.title, j.company, j.location, j.job_type, j.date_posted,
+                                j.url, j.source, j.description)::text) AS source_hash
+                    FROM jobs j
+                    JOIN jobs_cleaned c ON c.url = j.url
+                    ORDER BY j.id, c.id DESC
+                ) m
+                WHERE c.id = m.cleaned_id
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
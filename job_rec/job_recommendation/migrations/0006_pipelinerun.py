@@ -0,0 +1,32 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:31
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_recommendation', '0005_jobcleaned_job_source_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PipelineRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stage', models.CharField(max_length=50)),
+                ('site', models.CharField(blank=True, default='', max_length=100)),
+                ('status', models.CharField(default='running', max_length=20)),
+                ('started_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('items', models.IntegerField(blank=True, null=True)),
+                ('error', models.TextField(blank=True, default='')),
+            ],
+            options={
+                'db_table': 'pipeline_runs',
+                'managed': True,
+                'indexes': [models.Index(fields=['stage', 'site', '-started_at'], name='pipeline_ru_stage_1e7185_idx')],
+            },
+        ),
+    ]
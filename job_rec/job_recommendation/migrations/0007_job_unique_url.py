@@ -0,0 +1,73 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_recommendation', '0006_pipelinerun'),
+    ]
+
+    operations = [
+        # unique_url used to be added at run time by run_scrapers.init_db, so it
+        # may already exist. Otherwise merge duplicate URLs into the oldest row
+        # first: saved jobs and categorized rows move to it where that does not
+        # clash with one it already has, and the rest follow the FK on_delete.
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    sql="""
+                        DO $$
+                        BEGIN
+                            IF EXISTS (
+                                SELECT 1 FROM pg_constraint
+                                WHERE conname = 'unique_url' AND conrelid = 'jobs'::regclass
+                            ) THEN
+                                RETURN;
+                            END IF;
+                            -- Check FKs as rows are deleted, ALTER TABLE refuses pending trigger events
+                            SET CONSTRAINTS ALL IMMEDIATE;
+
+                            CREATE TEMP TABLE job_duplicates ON COMMIT DROP AS
+                            SELECT id, keep_id FROM (
+                                SELECT id, min(id) OVER (PARTITION BY url) AS keep_id FROM jobs WHERE url IS NOT NULL
+                            ) j
+                            WHERE id <> keep_id;
+
+                            UPDATE saved_job s SET job_id = m.keep_id
+                            FROM (
+                                SELECT DISTINCT ON (s.user_id, d.keep_id) s.id, d.keep_id
+                                FROM saved_job s JOIN job_duplicates d ON d.id = s.job_id
+                                WHERE NOT EXISTS (
+                                    SELECT 1 FROM saved_job k WHERE k.user_id = s.user_id AND k.job_id = d.keep_id
+                                )
+                                ORDER BY s.user_id, d.keep_id, s.id
+                            ) m
+                            WHERE s.id = m.id;
+                            DELETE FROM saved_job s USING job_duplicates d WHERE s.job_id = d.id;
+
+                            UPDATE jobs_cleaned c SET job_id = m.keep_id
+                            FROM (
+                                SELECT DISTINCT ON (d.keep_id) c.id, d.keep_id
+                                FROM jobs_cleaned c JOIN job_duplicates d ON d.id = c.job_id
+                                WHERE NOT EXISTS (SELECT 1 FROM jobs_cleaned k WHERE k.job_id = d.keep_id)
+                                ORDER BY d.keep_id, c.id DESC
+                            ) m
+                            WHERE c.id = m.id;
+                            UPDATE jobs_cleaned c SET job_id = NULL FROM job_duplicates d WHERE c.job_id = d.id;
+
+                            DELETE FROM jobs j USING job_duplicates d WHERE j.id = d.id;
+                            ALTER TABLE jobs ADD CONSTRAINT unique_url UNIQUE (url);
+                        END
+                        $$;
+                    """,
+                    reverse_sql="ALTER TABLE jobs DROP CONSTRAINT IF EXISTS unique_url",
+                ),
+            ],
+            state_operations=[
+                migrations.AddConstraint(
+                    model_name='job',
+                    constraint=models.UniqueConstraint(fields=('url',), name='unique_url'),
+                ),
+            ],
+        ),
+    ]
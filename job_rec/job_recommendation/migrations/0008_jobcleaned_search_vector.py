@@ -0,0 +1,24 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:34
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_recommendation', '0007_job_unique_url'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobcleaned',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('title', config='english', weight='A'), '||', django.contrib.postgres.search.SearchVector('company', config='english', weight='B'), django.contrib.postgres.search.SearchConfig('english')), '||', django.contrib.postgres.search.SearchVector('description', config='english', weight='C'), django.contrib.postgres.search.SearchConfig('english')), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='jobcleaned',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='jobs_cleaned_search_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_recommendation', '0008_jobcleaned_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobcleaned',
+            index=models.Index(fields=['-date_posted', '-id'], name='jobs_cleaned_listing_idx'),
+        ),
+    ]
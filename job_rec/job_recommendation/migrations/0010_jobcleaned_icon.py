@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_recommendation', '0009_jobcleaned_listing_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobcleaned',
+            name='icon',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+    ]
@@ -0,0 +1,74 @@
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from django.db import migrations
+
+_TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid')
+
+
+def normalize_url(url):
+    # Frozen copy of scraper.ingest.normalize_url as of this migration
+    parts = urlsplit(url.strip())
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not k.startswith(_TRACKING_PARAMS)]
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, urlencode(query), ''))
+
+
+MERGE_DUPLICATES_SQL = """
+    UPDATE saved_job s SET job_id = m.keep_id
+    FROM (
+        SELECT DISTINCT ON (s.user_id, d.keep_id) s.id, d.keep_id
+        FROM saved_job s JOIN job_duplicates d ON d.id = s.job_id
+        WHERE NOT EXISTS (
+            SELECT 1 FROM saved_job k WHERE k.user_id = s.user_id AND k.job_id = d.keep_id
+        )
+        ORDER BY s.user_id, d.keep_id, s.id
+    ) m
+    WHERE s.id = m.id;
+    DELETE FROM saved_job s USING job_duplicates d WHERE s.job_id = d.id;
+
+    UPDATE jobs_cleaned c SET job_id = m.keep_id
+    FROM (
+        SELECT DISTINCT ON (d.keep_id) c.id, d.keep_id
+        FROM jobs_cleaned c JOIN job_duplicates d ON d.id = c.job_id
+        WHERE NOT EXISTS (SELECT 1 FROM jobs_cleaned k WHERE k.job_id = d.keep_id)
+        ORDER BY d.keep_id, c.id DESC
+    ) m
+    WHERE c.id = m.id;
+    UPDATE jobs_cleaned c SET job_id = NULL FROM job_duplicates d WHERE c.job_id = d.id;
+
+    DELETE FROM jobs j USING job_duplicates d WHERE j.id = d.id;
+"""
+
+
+def normalize_job_urls(apps, schema_editor):
+    """
+    Rewrite jobs.url to the normalized form the scrapers upsert on, so
+    ON CONFLICT (url) matches rows stored before normalization. Rows that
+    normalize to the same URL are merged into the oldest one first, the same
+    way 0007 merged exact duplicates. The categorizer picks up the changed
+    URLs on its next incremental run.
+    """
+    groups = {}
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT id, url FROM jobs WHERE url IS NOT NULL ORDER BY id")
+        for job_id, url in cursor.fetchall():
+            groups.setdefault(normalize_url(url), []).append((job_id, url))
+
+        duplicates = [(job_id, rows[0][0]) for rows in groups.values() for job_id, _ in rows[1:]]
+        renames = [(url, rows[0][0]) for url, rows in groups.items() if rows[0][1] != url]
+        if duplicates:
+            cursor.execute("CREATE TEMP TABLE job_duplicates (id integer PRIMARY KEY, keep_id integer) ON COMMIT DROP")
+            cursor.executemany("INSERT INTO job_duplicates (id, keep_id) VALUES (%s, %s)", duplicates)
+            cursor.execute(MERGE_DUPLICATES_SQL)
+            cursor.execute("DROP TABLE job_duplicates")
+        cursor.executemany("UPDATE jobs SET url = %s WHERE id = %s", renames)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_recommendation', '0010_jobcleaned_icon'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_job_urls, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,146 @@
+"""
+Streaming categorization of the jobs table into jobs_cleaned.
+
+Rows are read through a server-side cursor in fixed-size chunks, so memory is
+bounded by the chunk size rather than the table size. Within a chunk, texts are
+sorted by length and classified in batches padded only to the longest text in
+the batch, under torch.inference_mode. Each chunk is written back with a
+single execute_values upsert keyed on jobs_cleaned.job_id, and the rows
+written are embedded for matching once the run ends (see embedding_store).
+
+By default only jobs that are new, or whose row changed since it was last
+categorized (compared via an md5 of the row stored in source_hash), are read,
+so nightly cost follows the day's new postings rather than the table size.
+"""
+import logging
+import re
+import time
+
+from django.db import connection
+from psycopg2.extras import execute_values
+
+from job_recommendation import model_registry
+from job_recommendation.display import job_icon
+from job_recommendation.page_cache import bump_data_version
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1000
+BATCH_SIZE = 32
+MAX_LENGTH = 256
+
+SELECT_JOBS_SQL = """
+    SELECT j.title, j.company, j.location, j.job_type, j.date_posted, j.url, j.source, j.description,
+           j.id, h.source_hash
+    FROM jobs j
+    CROSS JOIN LATERAL (
+        SELECT md5(ROW(j.title, j.company, j.location, j.job_type, j.date_posted,
+                       j.url, j.source, j.description)::text) AS source_hash
+    ) h
+    LEFT JOIN jobs_cleaned c ON c.job_id = j.id
+    {where}
+    ORDER BY j.id
+"""
+
+NEW_OR_CHANGED_FILTER = "WHERE c.id IS NULL OR c.source_hash <> h.source_hash"
+
+INSERT_CLEANED_SQL = """
+    INSERT INTO jobs_cleaned (title, company, location, job_type, date_posted, url, source, description,
+                              job_id, source_hash, category, icon)
+    VALUES %s
+    ON CONFLICT (job_id) DO UPDATE
+    SET title = EXCLUDED.title, company = EXCLUDED.company, location = EXCLUDED.location,
+        job_type = EXCLUDED.job_type, date_posted = EXCLUDED.date_posted, url = EXCLUDED.url,
+        source = EXCLUDED.source, description = EXCLUDED.description,
+        source_hash = EXCLUDED.source_hash, category = EXCLUDED.category, icon = EXCLUDED.icon
+    RETURNING id
+"""
+
+_stop_words = None
+
+
+def preprocess_text(text):
+    """Same normalization the classifier was trained on (see test_BERT.py)."""
+    global _stop_words
+    if _stop_words is None:
+        import nltk
+        from nltk.corpus import stopwords
+        nltk.download('stopwords', quiet=True)
+        _stop_words = set(stopwords.words('english'))
+    text = re.sub(r'[^a-zA-Z\s]', '', text.lower())
+    return ' '.join(word for word in text.split() if word not in _stop_words)
+
+
+def job_text(title, description):
+    if not description or description == "N/A":
+        description = title
+    return preprocess_text(f"{title} {description}")
+
+
+def predict_categories(texts, batch_size=BATCH_SIZE, classifier=None):
+    """
+    Classify texts in length-sorted, dynamically padded batches. classifier is
+    a (tokenizer, model, label_encoder) tuple; defaults to the registry's.
+    """
+    import torch
+
+    tokenizer, model, label_encoder = classifier or model_registry.get('category_classifier')
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    predictions = [0] * len(texts)
+    with torch.inference_mode():
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            inputs = tokenizer(
+                [texts[i] for i in batch],
+                return_tensors='pt',
+                padding='longest',
+                truncation=True,
+                max_length=MAX_LENGTH,
+            )
+            logits = model(**inputs).logits
+            for i, predicted in zip(batch, logits.argmax(dim=1).tolist()):
+                predictions[i] = predicted
+    return label_encoder.inverse_transform(predictions)
+
+
+def categorize_jobs_streaming(chunk_size=CHUNK_SIZE, batch_size=BATCH_SIZE, incremental=True):
+    """
+    Classify jobs into jobs_cleaned: only new or changed rows when incremental,
+    otherwise every row, then embed the rows written. Returns the number of
+    jobs classified.
+    """
+    from job_recommendation.model2_reccomender.embedding_store import store_job_embeddings
+
+    total = 0
+    written = []
+    started = time.perf_counter()
+    with connection.chunked_cursor() as reader, connection.cursor() as writer:
+        reader.execute(SELECT_JOBS_SQL.format(where=NEW_OR_CHANGED_FILTER if incremental else ''))
+        while True:
+            rows = reader.fetchmany(chunk_size)
+            if not rows:
+                break
+            chunk_started = time.perf_counter()
+            texts = [job_text(row[0], row[7]) for row in rows]
+            categories = predict_categories(texts, batch_size=batch_size)
+            written += [cleaned_id for (cleaned_id,) in execute_values(
+                writer.cursor,
+                INSERT_CLEANED_SQL,
+                [
+                    (*row[:7], row[7] or row[0], row[8], row[9], category, job_icon(row[0]))
+                    for row, category in zip(rows, categories)
+                ],
+                page_size=chunk_size,
+                fetch=True,
+            )]
+            total += len(rows)
+            elapsed = time.perf_counter() - chunk_started
+            logger.info(f"Categorized {len(rows)} jobs in {elapsed:.2f}s ({len(rows) / elapsed:.1f} rows/s)")
+    if total:
+        bump_data_version()
+        store_job_embeddings(written)
+    logger.info(
+        f"Categorized {total} jobs ({'incremental' if incremental else 'full'} run) "
+        f"in {time.perf_counter() - started:.2f}s"
+    )
+    return total
@@ -0,0 +1,197 @@
+"""
+Inference backends for the BERT category classifier.
+
+- 'torch':     the fp32 PyTorch model (reference).
+- 'quantized': dynamic int8 quantization of the nn.Linear layers.
+- 'onnx':      the model exported to ONNX and run with onnxruntime.
+
+A fast backend only serves once check_parity() has recorded that its accuracy
+on model/job_data.csv (labels from label_encoder.pkl) is within the tolerance
+of the fp32 model. The approval records the sha256 of the files it checked
+(model.safetensors, plus classifier.onnx for 'onnx'); if either has changed
+since, the backend has to pass the check again. Until then the loader falls
+back to 'torch'.
+Every backend returns an object whose __call__(**inputs).logits matches the
+transformers model, so callers do not care which one they got.
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.utils import timezone
+
+from .model_utils import MODEL_DIR, MODEL_PATH
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ('torch', 'quantized', 'onnx')
+ONNX_PATH = os.path.join(MODEL_DIR, 'classifier.onnx')
+PARITY_PATH = os.path.join(MODEL_DIR, 'classifier_parity.json')
+PARITY_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'job_data.csv')
+PARITY_TOLERANCE = 0.01
+
+
+def set_torch_threads():
+    """Apply TORCH_NUM_THREADS so the single web worker does not oversubscribe the CPU."""
+    import torch
+
+    num_threads = getattr(settings, 'TORCH_NUM_THREADS', None)
+    if num_threads:
+        torch.set_num_threads(num_threads)
+
+
+def quantize(model):
+    import torch
+
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def export_onnx(model, tokenizer, path=ONNX_PATH):
+    import torch
+
+    sample = tokenizer(["export sample"], return_tensors='pt')
+    names = ['input_ids', 'attention_mask', 'token_type_ids']
+    dynamic = {name: {0: 'batch', 1: 'sequence'} for name in names}
+    dynamic['logits'] = {0: 'batch'}
+    with torch.inference_mode():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in names),
+            path,
+            input_names=names,
+            output_names=['logits'],
+            dynamic_axes=dynamic,
+            opset_version=17,
+            dynamo=False,
+        )
+    logger.info(f"Exported category classifier to {path}")
+    return path
+
+
+class OnnxClassifier:
+    """onnxruntime session with the call signature of the transformers model."""
+
+    def __init__(self, path=ONNX_PATH):
+        import onnxruntime
+
+        options = onnxruntime.SessionOptions()
+        num_threads = getattr(settings, 'TORCH_NUM_THREADS', None)
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = onnxruntime.InferenceSession(path, options, providers=['CPUExecutionProvider'])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def __call__(self, **inputs):
+        import torch
+
+        feeds = {name: tensor.numpy() for name, tensor in inputs.items() if name in self.input_names}
+        logits = self.session.run(['logits'], feeds)[0]
+        return SimpleNamespace(logits=torch.from_numpy(logits))
+
+
+def build_backend(model, tokenizer, backend):
+    if backend == 'quantized':
+        return quantize(model)
+    if backend == 'onnx':
+        if not os.path.exists(ONNX_PATH):
+            export_onnx(model, tokenizer)
+        return OnnxClassifier()
+    return model
+
+
+def _checked_files(backend):
+    """{file name: sha256} of the files a parity approval for backend covers."""
+    paths = [MODEL_PATH] + ([ONNX_PATH] if backend == 'onnx' else [])
+    hashes = {}
+    for path in paths:
+        digest = hashlib.sha256()
+        try:
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+        except OSError:
+            hashes[os.path.basename(path)] = None
+            continue
+        hashes[os.path.basename(path)] = digest.hexdigest()
+    return hashes
+
+
+def _read_parity():
+    try:
+        with open(PARITY_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def resolve_backend(requested):
+    """Return requested if it is 'torch' or has passed the parity check, else 'torch'."""
+    if requested == 'torch':
+        return requested
+    if requested not in BACKENDS:
+        logger.warning(f"Unknown classifier backend '{requested}', using torch")
+        return 'torch'
+    parity = _read_parity().get(requested, {})
+    if not parity.get('approved'):
+        logger.warning(f"Classifier backend '{requested}' has not passed the parity check, using torch")
+        return 'torch'
+    if parity.get('files') != _checked_files(requested):
+        logger.warning(
+            f"Classifier files changed since backend '{requested}' passed the parity check, using torch; "
+            f"run `manage.py check_classifier_backend {requested}` again"
+        )
+        return 'torch'
+    return requested
+
+
+def check_parity(backend, sample_size=1000, tolerance=PARITY_TOLERANCE):
+    """
+    Compare backend against the fp32 model on a sample of job_data.csv and
+    record the result in PARITY_PATH. Returns the recorded result.
+    """
+    import pandas as pd
+    from .categorizer import job_text, predict_categories
+    from .recommender import load_fp32_classifier
+
+    tokenizer, model, label_encoder = load_fp32_classifier()
+    if backend == 'onnx':
+        # Always check a fresh export of the current weights
+        export_onnx(model, tokenizer)
+    candidate = build_backend(model, tokenizer, backend)
+
+    data = pd.read_csv(PARITY_DATA_PATH)
+    data = data[data['category'].isin(label_encoder.classes_)]
+    data = data.sample(n=min(sample_size, len(data)), random_state=0)
+    texts = [job_text(title, description) for title, description in zip(data['title'], data['description'])]
+    labels = data['category'].tolist()
+
+    def evaluate(classifier):
+        started = time.perf_counter()
+        predicted = list(predict_categories(texts, classifier=(tokenizer, classifier, label_encoder)))
+        elapsed = time.perf_counter() - started
+        accuracy = sum(p == label for p, label in zip(predicted, labels)) / len(labels)
+        return predicted, accuracy, elapsed
+
+    reference, reference_accuracy, reference_seconds = evaluate(model)
+    predicted, accuracy, seconds = evaluate(candidate)
+    result = {
+        'approved': accuracy >= reference_accuracy - tolerance,
+        'accuracy': accuracy,
+        'reference_accuracy': reference_accuracy,
+        'agreement': sum(a == b for a, b in zip(predicted, reference)) / len(labels),
+        'seconds': seconds,
+        'reference_seconds': reference_seconds,
+        'sample_size': len(labels),
+        'tolerance': tolerance,
+        'checked_at': timezone.now().isoformat(),
+        'files': _checked_files(backend),
+    }
+    results = _read_parity()
+    results[backend] = result
+    with open(PARITY_PATH, 'w') as f:
+        json.dump(results, f, indent=2)
+    return result
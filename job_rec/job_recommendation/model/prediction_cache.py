@@ -0,0 +1,125 @@
+"""
+Memoized category predictions for recommend_category.
+
+Predictions are keyed by a hash of the normalized input text and the backend
+the classifier is actually served with (CLASSIFIER_BACKEND only once it has
+passed the parity check, see inference.resolve_backend). Lookups go through an in-process LRU with a TTL first and,
+when PREDICTION_CACHE_SHARED is set, the default Django cache second, so a
+profile that has not changed is only run through the classifier once.
+The hit/miss counters are per process; every PREDICTION_CACHE_LOG_EVERY
+lookups they are written to the log.
+"""
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'category-prediction'
+
+_entries = OrderedDict()  # key -> (expires_at, (category, logits))
+_lock = threading.Lock()
+_stats = {'local_hits': 0, 'shared_hits': 0, 'misses': 0}
+
+
+def normalize(text):
+    return re.sub(r'\s+', ' ', text).strip().lower()
+
+
+def cache_key(text, backend):
+    digest = hashlib.sha256(normalize(text).encode('utf-8')).hexdigest()
+    return f"{KEY_PREFIX}:{backend}:{digest}"
+
+
+def _shared_cache():
+    if not settings.PREDICTION_CACHE_SHARED:
+        return None
+    from django.core.cache import cache
+    return cache
+
+
+def get_or_predict(text, predict, backend):
+    """
+    Return the cached (category, logits) that backend predicted for text,
+    calling predict(text) and storing its result on a miss.
+    """
+    key = cache_key(text, backend)
+    now = time.monotonic()
+    with _lock:
+        entry = _entries.get(key)
+        if entry and entry[0] > now:
+            _entries.move_to_end(key)
+        else:
+            _entries.pop(key, None)
+            entry = None
+    if entry:
+        _count('local_hits')
+        return entry[1]
+
+    shared = _shared_cache()
+    value = shared.get(key) if shared is not None else None
+    if value is not None:
+        value = tuple(value)
+        outcome = 'shared_hits'
+    else:
+        outcome = 'misses'
+        value = predict(text)
+        if shared is not None:
+            shared.set(key, value, settings.PREDICTION_CACHE_TTL)
+
+    _store(key, value)
+    _count(outcome)
+    return value
+
+
+def _count(name):
+    with _lock:
+        _stats[name] += 1
+        lookups = _stats['local_hits'] + _stats['shared_hits'] + _stats['misses']
+    every = settings.PREDICTION_CACHE_LOG_EVERY
+    if every and lookups % every == 0:
+        result = stats()
+        logger.info(
+            f"Prediction cache: {result['local_hits']} local hits, {result['shared_hits']} shared hits, "
+            f"{result['misses']} misses ({result['hit_ratio']:.1%} hit ratio), {result['size']} entries"
+        )
+
+
+def _store(key, value):
+    with _lock:
+        _entries[key] = (time.monotonic() + settings.PREDICTION_CACHE_TTL, value)
+        _entries.move_to_end(key)
+        while len(_entries) > settings.PREDICTION_CACHE_SIZE:
+            _entries.popitem(last=False)
+
+
+def invalidate(text):
+    """Forget the predictions for text in both tiers, whichever backend made them."""
+    from .inference import BACKENDS
+
+    keys = [cache_key(text, backend) for backend in BACKENDS]
+    with _lock:
+        for key in keys:
+            _entries.pop(key, None)
+    shared = _shared_cache()
+    if shared is not None:
+        shared.delete_many(keys)
+
+
+def clear():
+    with _lock:
+        _entries.clear()
+
+
+def stats():
+    """Hit/miss counters for this process, plus the current in-process size."""
+    with _lock:
+        result = dict(_stats, size=len(_entries))
+    lookups = result['local_hits'] + result['shared_hits'] + result['misses']
+    result['hit_ratio'] = (lookups - result['misses']) / lookups if lookups else 0.0
+    return result
@@ -1,19 +1,55 @@
 import os
-import torch
-import joblib
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from job_recommendation import model_registry
+from . import prediction_cache
 from .model_utils import ensure_model_downloaded, MODEL_DIR
 
-ensure_model_downloaded()
-tokenizer = AutoTokenizer.from_pretrained(MODEL_DIR)
-model = AutoModelForSequenceClassification.from_pretrained(MODEL_DIR, use_safetensors=True)
-label_encoder = joblib.load(os.path.join(MODEL_DIR, 'label_encoder.pkl'))
+# Backend the registry's category classifier was loaded with
+_serving = {}
 
-def recommend_category(text):
+def load_fp32_classifier():
+    import joblib
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+    ensure_model_downloaded()
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_DIR)
+    model = AutoModelForSequenceClassification.from_pretrained(MODEL_DIR, use_safetensors=True)
+    model.eval()
+    label_encoder = joblib.load(os.path.join(MODEL_DIR, 'label_encoder.pkl'))
+    return tokenizer, model, label_encoder
+
+def load_category_classifier():
+    """
+    Loader for the 'category_classifier' entry of the model registry. Serves
+    the CLASSIFIER_BACKEND setting if it has passed the parity check.
+    """
+    from django.conf import settings
+    from .inference import build_backend, resolve_backend, set_torch_threads
+
+    set_torch_threads()
+    tokenizer, model, label_encoder = load_fp32_classifier()
+    backend = resolve_backend(settings.CLASSIFIER_BACKEND)
+    classifier = build_backend(model, tokenizer, backend)
+    _serving['backend'] = backend
+    return tokenizer, classifier, label_encoder
+
+def serving_backend():
+    """Backend the category classifier is served with (loads it if needed)."""
+    model_registry.get('category_classifier')
+    return _serving['backend']
+
+def predict_category(text):
+    """Run the classifier on text; returns (category, logits as a list)."""
+    import torch
+
+    tokenizer, model, label_encoder = model_registry.get('category_classifier')
     inputs = tokenizer(text, return_tensors="pt", truncation=True, padding=True)
     with torch.no_grad():
         outputs = model(**inputs)
         logits = outputs.logits
         predicted_class = torch.argmax(logits, dim=1).item()
     category = label_encoder.inverse_transform([predicted_class])[0]
-    return category
\ No newline at end of file
+    return str(category), logits[0].tolist()
+
+def recommend_category(text):
+    category, logits = prediction_cache.get_or_predict(text, predict_category, serving_backend())
+    return category
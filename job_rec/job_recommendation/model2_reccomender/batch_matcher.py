@@ -0,0 +1,94 @@
+"""
+Batch matcher: scores every user against every job in one pass.
+
+All user profiles are encoded in a single batched call and job vectors come
+from the embedding store, so a full run costs O(users + jobs) encodes. The
+users x jobs similarity matrix is computed in row blocks over L2-normalized
+float32 arrays, and the top N per row is selected with argpartition.
+"""
+import logging
+import time
+
+import numpy as np
+
+from job_recommendation.model2_reccomender.embedding_store import get_job_embeddings
+
+logger = logging.getLogger(__name__)
+
+# Users per similarity block. 256 users x 25k jobs x float32 is ~25 MB.
+DEFAULT_BLOCK_SIZE = 256
+
+
+def user_profile_text(user):
+    """Text that gets embedded for a user profile."""
+    return ' '.join([
+        user.name or '',
+        user.academic_qualification or '',
+        user.experience or '',
+        ', '.join(user.skills) if user.skills else '',
+        user.about or ''
+    ])
+
+
+def normalize_rows(matrix):
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def top_n_similar(user_vectors, job_vectors, top_n, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Yield (user_row, job_indices, scores) for each row of user_vectors, best
+    match first. Both inputs must already be L2-normalized, so the dot product
+    is the cosine similarity.
+    """
+    n_jobs = job_vectors.shape[0]
+    k = min(top_n, n_jobs)
+    if k == 0:
+        return
+    job_vectors_t = np.ascontiguousarray(job_vectors.T)
+    for start in range(0, user_vectors.shape[0], block_size):
+        scores = user_vectors[start:start + block_size] @ job_vectors_t
+        if k < n_jobs:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(n_jobs), scores.shape).copy()
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        for row in range(scores.shape[0]):
+            yield start + row, top[row], top_scores[row]
+
+
+def match_users(user_ids=None, top_n=5, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Compute the top N jobs for each user (all users, or just user_ids).
+    Returns a list of (user, [(job, score), ...]) tuples.
+    """
+    from job_recommendation.models import User, JobCleaned
+    from job_recommendation.model2_reccomender.eish import compute_embeddings
+
+    users = User.objects.only('id', 'name', 'email', 'academic_qualification', 'experience', 'skills', 'about')
+    if user_ids is not None:
+        users = users.filter(id__in=user_ids)
+    users = list(users.order_by('id'))
+    jobs = list(JobCleaned.objects.only('id', 'title', 'category').order_by('id'))
+    if not users or not jobs:
+        return [(user, []) for user in users]
+
+    started = time.perf_counter()
+    job_vectors = normalize_rows(get_job_embeddings(jobs))
+    user_vectors = normalize_rows(compute_embeddings([user_profile_text(user) for user in users]))
+    encoded = time.perf_counter()
+
+    results = []
+    for row, job_indices, scores in top_n_similar(user_vectors, job_vectors, top_n, block_size):
+        results.append((users[row], [(jobs[i], float(score)) for i, score in zip(job_indices, scores)]))
+
+    logger.info(
+        f"Matched {len(users)} users against {len(jobs)} jobs "
+        f"(embeddings {encoded - started:.2f}s, scoring {time.perf_counter() - encoded:.2f}s)"
+    )
+    return results
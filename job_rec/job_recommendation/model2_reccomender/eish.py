@@ -1,12 +1,21 @@
+import logging
 import pandas as pd
 import numpy as np
-from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
 import asyncio
 import platform
+from job_recommendation.model2_reccomender.embedding_store import EMBEDDING_MODEL_NAME, get_job_embeddings
+from job_recommendation.model2_reccomender.batch_matcher import match_users, user_profile_text
+from job_recommendation.model2_reccomender.job_index import get_job_index
+from job_recommendation.model2_reccomender.match_writer import write_matches
+from job_recommendation import model_registry
 
-# Load the BERT model
-model = SentenceTransformer('all-MiniLM-L6-v2')
+logger = logging.getLogger(__name__)
+
+def load_sentence_transformer():
+    """Loader for the 'sentence_transformer' entry of the model registry."""
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(EMBEDDING_MODEL_NAME)
 
 # USER_DATA_PATH = r"job_rec\job_recommendation\model2_reccomender\user_data.csv"
 # JOB_LISTINGS_PATH = r"job_rec\job_recommendation\model2_reccomender\data.csv"
@@ -51,6 +60,7 @@ def combine_job_fields(row):
 
 # Function to compute embeddings
 def compute_embeddings(texts):
+    model = model_registry.get('sentence_transformer')
     return model.encode(texts, convert_to_tensor=False)
 
 # Function to match users to jobs
@@ -107,27 +117,21 @@ def recommend_jobs_for_user(user_id, top_n=5):
         return []
 
     # Combine user profile fields
-    user_profile = ' '.join([
-        user.name or '',
-        user.academic_qualification or '',
-        user.experience or '',
-        ', '.join(user.skills) if hasattr(user, 'skills') and user.skills else '',
-        user.about or ''
-    ])
-
-    # Fetch all jobs from jobs_cleaned
-    jobs = list(JobCleaned.objects.all())
-    if not jobs:
-        return []
+    user_profile = user_profile_text(user)
 
-    # Combine job fields
-    job_profiles = [
-        ' '.join([job.title or '', job.category or '']) for job in jobs
-    ]
-
-    # Compute embeddings
+    # Compute the profile embedding
     user_embedding = compute_embeddings([user_profile])[0]
-    job_embeddings = compute_embeddings(job_profiles)
+
+    # Use the saved vector index when there is one
+    index = get_job_index()
+    if index is not None and len(index):
+        return search_job_index(index, [user_embedding], top_n)[0]
+
+    # No index yet: brute force against the stored job embeddings
+    jobs = list(JobCleaned.objects.only('id', 'title', 'category'))
+    if not jobs:
+        return []
+    job_embeddings = get_job_embeddings(jobs)
 
     # Compute cosine similarity
     similarities = cosine_similarity([user_embedding], job_embeddings)[0]
@@ -138,6 +142,43 @@ def recommend_jobs_for_user(user_id, top_n=5):
     # Return list of (job_instance, similarity_score)
     return [(jobs[i], similarities[i]) for i in top_indices]
 
+def search_job_index(index, user_vectors, top_n=5):
+    """
+    Top N (job, score) list per user vector from the saved job index. The
+    sync stage prunes deleted jobs; over-fetch a little so jobs deleted since
+    then can still be dropped.
+    """
+    from job_recommendation.models import JobCleaned
+
+    hits = [index.search(vector, top_n * 2) for vector in user_vectors]
+    jobs_by_id = JobCleaned.objects.only('id', 'title', 'category').in_bulk(
+        {job_id for user_hits in hits for job_id, _ in user_hits}
+    )
+    return [
+        [(jobs_by_id[job_id], score) for job_id, score in user_hits if job_id in jobs_by_id][:top_n]
+        for user_hits in hits
+    ]
+
+def match_users_from_index(user_ids, top_n=5):
+    """
+    Like batch_matcher.match_users for a few users, but searching the saved
+    job index instead of scoring every job, so no job rows or vectors are
+    loaded beyond the matches. Falls back to match_users without an index.
+    """
+    from job_recommendation.models import User
+
+    index = get_job_index()
+    if index is None or not len(index):
+        return match_users(user_ids=user_ids, top_n=top_n)
+    users = list(
+        User.objects.only('id', 'name', 'email', 'academic_qualification', 'experience', 'skills', 'about')
+        .filter(id__in=user_ids).order_by('id')
+    )
+    if not users:
+        return []
+    user_vectors = compute_embeddings([user_profile_text(user) for user in users])
+    return list(zip(users, search_job_index(index, user_vectors, top_n)))
+
 def save_matches_to_db(user_id, top_n=5):
     """
     For a given user_id, compute top N job matches and save them to the MatchedJob table.
@@ -146,43 +187,21 @@ def save_matches_to_db(user_id, top_n=5):
     import django
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'job_rec.settings')
     django.setup()
-    from job_recommendation.models import MatchedJob, User, JobCleaned
+    from job_recommendation.models import User
 
-    print(f"[DEBUG] Running save_matches_to_db for user_id={user_id}")
+    logger.debug(f"Running save_matches_to_db for user_id={user_id}")
     try:
         user = User.objects.get(id=user_id)
-        print(f"[DEBUG] Found user: {user.name} ({user.email})")
     except User.DoesNotExist:
-        print(f"[DEBUG] User with id {user_id} does not exist.")
+        logger.warning(f"User with id {user_id} does not exist")
         return 0
 
-    jobs = list(JobCleaned.objects.all())
-    print(f"[DEBUG] Found {len(jobs)} jobs in JobCleaned table.")
-
     matches = recommend_jobs_for_user(user_id, top_n=top_n)
-    print(f"[DEBUG] Computed {len(matches)} matches.")
+    logger.debug(f"Computed {len(matches)} matches for user {user_id}")
     if not matches:
-        print("[DEBUG] No matches to save.")
+        logger.info(f"No matches to save for user {user_id}")
         return 0
-
-    # Clear old matches for this user
-    MatchedJob.objects.filter(user_id=user_id).delete()
-    print("[DEBUG] Cleared old matches for user.")
-
-    # Save new matches
-    for job, score in matches:
-        MatchedJob.objects.create(
-            user_id=user.id,
-            user_name=user.name,
-            user_email=user.email,
-            job_id=job.id,
-            job_title=job.title,
-            job_category=job.category,
-            similarity_score=score
-        )
-        print(f"[DEBUG] Saved match: job_id={job.id}, score={score}")
-    print(f"[DEBUG] Done saving {len(matches)} matches for user_id={user_id}.")
-    return len(matches)
+    return write_matches([(user, matches)])
 
 # Batch process: For all users, compute and save top N job matches to the database
 
@@ -191,17 +210,32 @@ def batch_save_all_matches(top_n=5):
     import django
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'job_rec.settings')
     django.setup()
-    from job_recommendation.models import User
 
-    users = User.objects.all()
-    print(f"[DEBUG] Found {users.count()} users.")
-    for user in users:
-        print(f"[DEBUG] Processing user: {user.id} - {user.name}")
+    saved = save_matches_for_users(None, top_n=top_n)
+    logger.info(f"Batch matching complete for {len(saved)} users")
+
+def save_matches_for_users(user_ids, top_n=5, write_batch_size=500):
+    """
+    Compute and save top N matches for user_ids (None means every user).
+    Matches are written in one bulk transaction per batch of users.
+    Returns the ids of users whose matches were written.
+    """
+    if user_ids is None:
+        # Encode every profile and the job corpus once, then score users x jobs
+        results = match_users(top_n=top_n)
+    else:
+        # A few queued users: search the job index per user
+        results = match_users_from_index(user_ids, top_n=top_n)
+    logger.info(f"Matched {len(results)} users")
+    saved = []
+    for start in range(0, len(results), write_batch_size):
+        batch = results[start:start + write_batch_size]
         try:
-            save_matches_to_db(user.id, top_n=top_n)
-        except Exception as e:
-            print(f"[ERROR] Failed for user {user.id}: {e}")
-    print("[DEBUG] Batch matching complete.")
+            write_matches(batch)
+            saved.extend(user.id for user, _ in batch)
+        except Exception:
+            logger.exception(f"Failed to save matches for users {batch[0][0].id}-{batch[-1][0].id}")
+    return saved
 
 # Remove or comment out all CSV reading/writing and main async logic
 
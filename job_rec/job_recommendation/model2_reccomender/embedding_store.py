@@ -0,0 +1,143 @@
+"""
+Persistent store of SentenceTransformer embeddings for JobCleaned rows.
+
+Vectors live in the job_embeddings table keyed by job id, together with a hash
+of the text they were computed from. A job is only re-encoded when its title or
+category (or the embedding model) changes, so matching a user only has to
+encode the user's profile. The categorizer embeds the rows it writes; the
+sync stage only fills in rows that have no vector yet.
+"""
+import hashlib
+import logging
+from itertools import islice
+
+import numpy as np
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
+EMBEDDING_DTYPE = np.float32
+
+
+def job_embedding_text(job):
+    """Text that gets embedded for a job (same fields as combine_job_fields)."""
+    return ' '.join([job.title or '', job.category or ''])
+
+
+def content_hash(text):
+    return hashlib.sha256(f"{EMBEDDING_MODEL_NAME}\n{text}".encode('utf-8')).hexdigest()
+
+
+def _encode(texts):
+    from job_recommendation.model2_reccomender.eish import compute_embeddings
+    return np.asarray(compute_embeddings(texts), dtype=EMBEDDING_DTYPE)
+
+
+def get_job_embeddings(jobs, update_index=True):
+    """
+    Return a float32 matrix with one embedding per job, in the order given.
+    Vectors that are missing or stale are encoded in a single batch and written
+    back to the store (and the saved job index, if update_index) before
+    returning.
+    """
+    from job_recommendation.models import JobEmbedding
+    from job_recommendation.model2_reccomender.job_index import add_to_job_index
+
+    if not jobs:
+        return np.zeros((0, 0), dtype=EMBEDDING_DTYPE)
+
+    hashes = [content_hash(job_embedding_text(job)) for job in jobs]
+    stored = {
+        job_id: (h, vector)
+        for job_id, h, vector in JobEmbedding.objects.filter(
+            job_id__in=[job.id for job in jobs]
+        ).values_list('job_id', 'content_hash', 'vector')
+    }
+
+    vectors = [None] * len(jobs)
+    stale = []
+    for i, job in enumerate(jobs):
+        entry = stored.get(job.id)
+        if entry is not None and entry[0] == hashes[i]:
+            vectors[i] = np.frombuffer(entry[1], dtype=EMBEDDING_DTYPE)
+        else:
+            stale.append(i)
+
+    if stale:
+        encoded = _encode([job_embedding_text(jobs[i]) for i in stale])
+        JobEmbedding.objects.bulk_create(
+            [
+                JobEmbedding(job_id=jobs[i].id, content_hash=hashes[i], vector=encoded[row].tobytes())
+                for row, i in enumerate(stale)
+            ],
+            update_conflicts=True,
+            unique_fields=['job'],
+            update_fields=['content_hash', 'vector', 'updated_at'],
+        )
+        for row, i in enumerate(stale):
+            vectors[i] = encoded[row]
+        if update_index:
+            add_to_job_index([jobs[i].id for i in stale], encoded)
+        logger.info(f"Encoded {len(stale)} new or changed job embeddings")
+
+    return np.vstack(vectors)
+
+
+def _embed_rows(jobs, chunk_size):
+    """
+    Fill in missing or stale embeddings for the JobCleaned queryset jobs, in
+    chunks, and add the vectors that changed to the saved job index in one
+    write. Returns (jobs checked, vectors updated).
+    """
+    from job_recommendation.models import JobEmbedding
+    from job_recommendation.model2_reccomender.job_index import add_to_job_index
+
+    rows = jobs.only('id', 'title', 'category').order_by('id').iterator(chunk_size=chunk_size)
+    total = 0
+    started = timezone.now()
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        get_job_embeddings(chunk, update_index=False)
+        total += len(chunk)
+
+    changed = list(JobEmbedding.objects.filter(updated_at__gte=started).values_list('job_id', 'vector'))
+    if changed:
+        add_to_job_index(
+            [job_id for job_id, _ in changed],
+            np.vstack([np.frombuffer(vector, dtype=EMBEDDING_DTYPE) for _, vector in changed]),
+        )
+    return total, len(changed)
+
+
+def store_job_embeddings(job_ids, chunk_size=512):
+    """
+    Embed the jobs_cleaned rows the categorizer just wrote, so matching can
+    reuse their vectors. Only rows whose text changed are encoded again.
+    """
+    from job_recommendation.models import JobCleaned
+
+    total, updated = _embed_rows(JobCleaned.objects.filter(id__in=list(job_ids)), chunk_size)
+    logger.info(f"Stored embeddings for {total} categorized jobs, {updated} updated")
+    return updated
+
+
+def sync_job_embeddings(chunk_size=512, full=False):
+    """
+    Embed the jobs_cleaned rows that have no stored vector yet, such as jobs
+    added through post_job, and prune deleted jobs from the saved job index.
+    Categorized jobs are already embedded by the categorizer. With full, also
+    re-check every stored hash, e.g. after changing EMBEDDING_MODEL_NAME.
+    """
+    from job_recommendation.models import JobCleaned
+    from job_recommendation.model2_reccomender.job_index import prune_job_index
+
+    jobs = JobCleaned.objects.all()
+    if not full:
+        jobs = jobs.filter(embedding__isnull=True)
+    total, updated = _embed_rows(jobs, chunk_size)
+    prune_job_index()
+    logger.info(f"Checked embeddings for {total} jobs, {updated} updated")
+    return total
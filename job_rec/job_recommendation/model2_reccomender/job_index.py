@@ -0,0 +1,360 @@
+"""
+Vector index over stored job embeddings.
+
+JobIndex is a small add/remove/search interface with two backends:
+
+- ExactIndex: brute-force inner product over a NumPy matrix.
+- IVFIndex: inverted-file index. Vectors are assigned to the nearest of
+  n_lists k-means centroids, and a search only scans the n_probe lists whose
+  centroids are closest to the query.
+
+Vectors are L2-normalized on insert, so scores are cosine similarities. The
+index is built from the job_embeddings table, saved to JOB_INDEX_PATH and
+updated incrementally when new job embeddings are stored. Every update of the
+saved file (load, modify, save) holds an flock on JOB_INDEX_PATH + '.lock', so
+the web workers, the scheduler and management commands never overwrite each
+other's changes. The sync stage also prunes jobs that no longer have an
+embedding (deleted jobs) from the saved index.
+"""
+import fcntl
+import logging
+import os
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+INDEX_PATH = getattr(
+    settings, 'JOB_INDEX_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'job_index.npz')
+)
+INDEX_BACKEND = getattr(settings, 'JOB_INDEX_BACKEND', 'ivf')
+
+
+def _normalize(vectors):
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class JobIndex:
+    """Interface shared by the index backends."""
+
+    backend = None
+
+    def add(self, job_ids, vectors):
+        """Insert or replace vectors for job_ids."""
+        raise NotImplementedError
+
+    def remove(self, job_ids):
+        raise NotImplementedError
+
+    def search(self, vector, k):
+        """Return up to k (job_id, score) tuples, best match first."""
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def needs_rebuild(self):
+        """Whether the index has outgrown the structure it was built with."""
+        return False
+
+    def _state(self):
+        raise NotImplementedError
+
+    @classmethod
+    def _from_state(cls, state):
+        raise NotImplementedError
+
+    def save(self, path=INDEX_PATH):
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, backend=np.array(self.backend), **self._state())
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def load(path=INDEX_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            state = {key: data[key] for key in data.files}
+        backend = str(state.pop('backend'))
+        return BACKENDS[backend]._from_state(state)
+
+
+def _top_k(ids, scores, k):
+    if len(ids) == 0:
+        return []
+    k = min(k, len(ids))
+    top = np.argpartition(-scores, k - 1)[:k] if k < len(ids) else np.arange(len(ids))
+    top = top[np.argsort(-scores[top])]
+    return [(int(ids[i]), float(scores[i])) for i in top]
+
+
+class ExactIndex(JobIndex):
+    backend = 'exact'
+
+    def __init__(self, dim=None):
+        self.dim = dim
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.vectors = np.zeros((0, dim or 0), dtype=np.float32)
+
+    def add(self, job_ids, vectors):
+        job_ids = np.asarray(job_ids, dtype=np.int64)
+        vectors = _normalize(vectors)
+        if self.dim is None or len(self.ids) == 0:
+            self.dim = vectors.shape[1]
+            self.vectors = np.zeros((0, self.dim), dtype=np.float32)
+        self.remove(job_ids)
+        self.ids = np.concatenate([self.ids, job_ids])
+        self.vectors = np.vstack([self.vectors, vectors])
+
+    def remove(self, job_ids):
+        keep = ~np.isin(self.ids, np.asarray(job_ids, dtype=np.int64))
+        self.ids = self.ids[keep]
+        self.vectors = self.vectors[keep]
+
+    def search(self, vector, k):
+        if len(self.ids) == 0:
+            return []
+        return _top_k(self.ids, self.vectors @ _normalize(vector)[0], k)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _state(self):
+        return {'ids': self.ids, 'vectors': self.vectors}
+
+    @classmethod
+    def _from_state(cls, state):
+        index = cls(dim=state['vectors'].shape[1])
+        index.ids = state['ids']
+        index.vectors = state['vectors']
+        return index
+
+
+class IVFIndex(JobIndex):
+    """
+    Inverted-file index. train() clusters a sample of the vectors with k-means;
+    afterwards each vector lives in the list of its nearest centroid. Adds
+    after training go straight into the matching list, so the scraper's daily
+    jobs do not require a rebuild until the index holds REBUILD_GROWTH times
+    the vectors it was trained on (see needs_rebuild).
+    """
+
+    backend = 'ivf'
+    REBUILD_GROWTH = 4
+
+    def __init__(self, n_lists=None, n_probe=8):
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.centroids = None
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.vectors = None
+        self.assignments = np.zeros(0, dtype=np.int32)
+        self.trained_on = 0
+        self._lists = None
+
+    def train(self, vectors, iterations=10, seed=0):
+        vectors = _normalize(vectors)
+        n_lists = self.n_lists or max(1, int(np.sqrt(len(vectors))))
+        n_lists = min(n_lists, len(vectors))
+        rng = np.random.default_rng(seed)
+        sample = vectors[rng.choice(len(vectors), size=min(len(vectors), n_lists * 64), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)]
+        for _ in range(iterations):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(n_lists):
+                members = sample[assign == c]
+                if len(members):
+                    centroids[c] = members.mean(axis=0)
+            centroids = _normalize(centroids)
+        self.n_lists = n_lists
+        self.centroids = centroids
+        self.trained_on = len(vectors)
+        self.vectors = np.zeros((0, vectors.shape[1]), dtype=np.float32)
+
+    def add(self, job_ids, vectors):
+        job_ids = np.asarray(job_ids, dtype=np.int64)
+        vectors = _normalize(vectors)
+        if self.centroids is None:
+            self.train(vectors)
+        self.remove(job_ids)
+        self.ids = np.concatenate([self.ids, job_ids])
+        self.vectors = np.vstack([self.vectors, vectors])
+        self.assignments = np.concatenate([
+            self.assignments, np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+        ])
+        self._lists = None
+
+    def remove(self, job_ids):
+        if self.vectors is None:
+            return
+        keep = ~np.isin(self.ids, np.asarray(job_ids, dtype=np.int64))
+        if keep.all():
+            return
+        self.ids = self.ids[keep]
+        self.vectors = self.vectors[keep]
+        self.assignments = self.assignments[keep]
+        self._lists = None
+
+    def _inverted_lists(self):
+        if self._lists is None:
+            order = np.argsort(self.assignments, kind='stable')
+            bounds = np.searchsorted(self.assignments[order], np.arange(self.n_lists + 1))
+            self._lists = [order[bounds[c]:bounds[c + 1]] for c in range(self.n_lists)]
+        return self._lists
+
+    def search(self, vector, k):
+        if not len(self.ids):
+            return []
+        query = _normalize(vector)[0]
+        n_probe = min(self.n_probe, self.n_lists)
+        probe = np.argpartition(-(self.centroids @ query), n_probe - 1)[:n_probe]
+        lists = self._inverted_lists()
+        candidates = np.concatenate([lists[c] for c in probe])
+        if len(candidates) < k:
+            candidates = np.arange(len(self.ids))
+        return _top_k(self.ids[candidates], self.vectors[candidates] @ query, k)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def needs_rebuild(self):
+        # Lists sized for the first few jobs would make every search scan most of the index
+        return len(self.ids) >= self.REBUILD_GROWTH * max(self.trained_on, 1)
+
+    def _state(self):
+        # Plain int and float32 arrays even before training: np.load refuses object arrays
+        empty = np.zeros((0, 0), dtype=np.float32)
+        return {
+            'n_lists': np.array(self.n_lists or 0), 'n_probe': np.array(self.n_probe),
+            'trained_on': np.array(self.trained_on),
+            'centroids': empty if self.centroids is None else self.centroids, 'ids': self.ids,
+            'vectors': empty if self.vectors is None else self.vectors, 'assignments': self.assignments,
+        }
+
+    @classmethod
+    def _from_state(cls, state):
+        index = cls(n_lists=int(state['n_lists']) or None, n_probe=int(state['n_probe']))
+        if state['centroids'].size:
+            index.centroids = state['centroids']
+            index.vectors = state['vectors']
+        index.ids = state['ids']
+        index.assignments = state['assignments']
+        index.trained_on = int(state['trained_on']) if 'trained_on' in state else len(index.ids)
+        return index
+
+
+BACKENDS = {
+    ExactIndex.backend: ExactIndex,
+    IVFIndex.backend: IVFIndex,
+}
+
+
+_lock = threading.Lock()
+_cache = {'index': None, 'mtime': None}
+
+
+@contextmanager
+def _file_lock(path):
+    """Exclusive lock shared by every process that rewrites the index at path."""
+    with open(f"{path}.lock", 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def build_job_index(backend=INDEX_BACKEND, path=INDEX_PATH, **options):
+    """
+    Build an index from every row in job_embeddings and save it to path.
+    With no rows nothing is saved (and an old file is removed), so matching
+    falls back to brute force until there are jobs to index.
+    """
+    from job_recommendation.models import JobEmbedding
+
+    with _lock, _file_lock(path):
+        rows = list(JobEmbedding.objects.values_list('job_id', 'vector'))
+        index = BACKENDS[backend](**options)
+        if not rows:
+            if os.path.exists(path):
+                os.remove(path)
+            _cache.update(index=None, mtime=None)
+            logger.info("No job embeddings yet, job index not built")
+            return index
+        index.add(
+            [job_id for job_id, _ in rows],
+            np.vstack([np.frombuffer(vector, dtype=np.float32) for _, vector in rows]),
+        )
+        index.save(path)
+        _cache.update(index=index, mtime=os.path.getmtime(path))
+    logger.info(f"Built {backend} job index with {len(index)} vectors at {path}")
+    return index
+
+
+def _load(path):
+    """JobIndex.load(path), or None if the file cannot be read (it is rebuilt by the sync stage)."""
+    try:
+        return JobIndex.load(path)
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Could not load job index {path}: {e}")
+        return None
+
+
+def get_job_index(path=INDEX_PATH):
+    """
+    Return the on-disk index, reloading it when another process has rewritten
+    the file. Returns None if no index has been built yet.
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    with _lock:
+        if _cache['index'] is None or _cache['mtime'] != mtime:
+            _cache['index'] = _load(path)
+            _cache['mtime'] = mtime
+        return _cache['index']
+
+
+@contextmanager
+def _update_saved_index(path):
+    """Yield the saved index (or None) for modification and save it afterwards."""
+    with _lock, _file_lock(path):
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            yield None
+            return
+        index = _cache['index'] if _cache['mtime'] == mtime else _load(path)
+        yield index
+        if index is None:
+            return
+        index.save(path)
+        _cache.update(index=index, mtime=os.path.getmtime(path))
+
+
+def add_to_job_index(job_ids, vectors, path=INDEX_PATH):
+    """Incrementally insert vectors into the saved index, if there is one."""
+    with _update_saved_index(path) as index:
+        if index is not None:
+            index.add(job_ids, vectors)
+
+
+def prune_job_index(path=INDEX_PATH):
+    """Remove jobs without a stored embedding (deleted jobs) from the saved index."""
+    from job_recommendation.models import JobEmbedding
+
+    with _update_saved_index(path) as index:
+        if index is None or not len(index):
+            return 0
+        live = np.fromiter(JobEmbedding.objects.values_list('job_id', flat=True), dtype=np.int64)
+        removed = index.ids[~np.isin(index.ids, live)]
+        index.remove(removed)
+    if len(removed):
+        logger.info(f"Removed {len(removed)} deleted jobs from the job index")
+    return len(removed)
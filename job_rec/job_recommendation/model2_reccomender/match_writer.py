@@ -0,0 +1,74 @@
+"""
+Bulk writer for the matched_jobs table.
+
+A batch of users is written in one transaction: new and changed rows go in
+through INSERT ... ON CONFLICT (user_id, job_id) DO UPDATE, and rows a user no
+longer matches are removed with a single DELETE.
+"""
+import logging
+import time
+
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+WRITE_BATCH_SIZE = 1000
+
+_DELETE_STALE_SQL = """
+    DELETE FROM matched_jobs m
+    WHERE m.user_id = ANY(%s)
+      AND NOT EXISTS (
+          SELECT 1 FROM unnest(%s::integer[], %s::integer[]) AS keep(user_id, job_id)
+          WHERE keep.user_id = m.user_id AND keep.job_id = m.job_id
+      )
+"""
+
+
+def write_matches(results):
+    """
+    Replace the stored matches for each user in results, a list of
+    (user, [(job, score), ...]) tuples. Users with no matches keep their
+    previous rows. Returns the number of rows upserted.
+    """
+    from job_recommendation.models import MatchedJob
+
+    rows = [
+        MatchedJob(
+            user_id=user.id,
+            user_name=user.name,
+            user_email=user.email,
+            job_id=job.id,
+            job_title=job.title,
+            job_category=job.category,
+            similarity_score=float(score),
+        )
+        for user, matches in results
+        for job, score in matches
+    ]
+    if not rows:
+        return 0
+    user_ids = sorted({row.user_id for row in rows})
+
+    started = time.perf_counter()
+    with transaction.atomic():
+        MatchedJob.objects.bulk_create(
+            rows,
+            batch_size=WRITE_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['user_id', 'job_id'],
+            update_fields=['user_name', 'user_email', 'job_title', 'job_category', 'similarity_score'],
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(_DELETE_STALE_SQL, [
+                user_ids,
+                [row.user_id for row in rows],
+                [row.job_id for row in rows],
+            ])
+            deleted = cursor.rowcount
+    elapsed = time.perf_counter() - started
+
+    logger.info(
+        f"Wrote {len(rows)} matches for {len(user_ids)} users, removed {deleted} stale, "
+        f"in {elapsed:.3f}s ({len(rows) / elapsed if elapsed else 0:.0f} rows/s)"
+    )
+    return len(rows)
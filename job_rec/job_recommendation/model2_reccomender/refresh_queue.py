@@ -0,0 +1,86 @@
+"""
+DB-backed queue of pending match refreshes.
+
+Profile views enqueue the user instead of recomputing matches inline; the
+process_match_queue command claims pending users in batches and searches the
+saved job index for them (falling back to the batch matcher until there is
+one). A user's previous matches stay in place until the new ones are written.
+"""
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# A claim older than this is assumed to belong to a dead worker and is retried.
+CLAIM_TIMEOUT = timedelta(minutes=10)
+
+
+def enqueue_match_refresh(user_id):
+    from job_recommendation.models import MatchRefreshRequest
+
+    MatchRefreshRequest.objects.update_or_create(
+        user_id=user_id,
+        defaults={'requested_at': timezone.now(), 'claimed_at': None},
+    )
+
+
+def is_refresh_pending(user_id):
+    from job_recommendation.models import MatchRefreshRequest
+
+    return MatchRefreshRequest.objects.filter(user_id=user_id).exists()
+
+
+def claim_batch(limit):
+    """
+    Mark up to limit pending requests as claimed and return them, oldest first.
+    Rows locked by another worker are skipped.
+    """
+    from job_recommendation.models import MatchRefreshRequest
+
+    now = timezone.now()
+    with transaction.atomic():
+        requests = list(
+            MatchRefreshRequest.objects.select_for_update(skip_locked=True)
+            .filter(Q(claimed_at__isnull=True) | Q(claimed_at__lt=now - CLAIM_TIMEOUT))
+            .order_by('requested_at')[:limit]
+        )
+        MatchRefreshRequest.objects.filter(id__in=[r.id for r in requests]).update(claimed_at=now)
+    return requests
+
+
+def complete(requests):
+    """
+    Drop finished requests. A user who was enqueued again while the batch was
+    running has a newer requested_at, so their row is kept for the next pass.
+    """
+    from job_recommendation.models import MatchRefreshRequest
+
+    q = Q(pk__in=[])
+    for r in requests:
+        q |= Q(id=r.id, requested_at=r.requested_at)
+    MatchRefreshRequest.objects.filter(q).delete()
+
+
+def process_batch(limit=50, top_n=6):
+    """Claim and refresh one batch. Returns the number of users processed."""
+    from job_recommendation.model2_reccomender.eish import save_matches_for_users
+
+    requests = claim_batch(limit)
+    if not requests:
+        return 0
+    saved = set(save_matches_for_users([r.user_id for r in requests], top_n=top_n))
+    # Users that no longer exist are dropped too; failed users stay claimed
+    # and are retried once the claim times out.
+    complete([r for r in requests if r.user_id in saved or not _user_exists(r.user_id)])
+    logger.info(f"Refreshed matches for {len(saved)} of {len(requests)} queued users")
+    return len(requests)
+
+
+def _user_exists(user_id):
+    from job_recommendation.models import User
+
+    return User.objects.filter(id=user_id).exists()
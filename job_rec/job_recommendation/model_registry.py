@@ -0,0 +1,60 @@
+"""
+Process-wide registry of ML models, loaded on first use.
+
+Importing views, urls or management commands no longer touches torch: each
+model is built by its loader the first time get() asks for it, under a
+per-model lock so concurrent requests load it only once. Set WARM_UP_MODELS
+to load everything when the WSGI application starts instead; the load
+times are logged there and by the model_load_times command.
+"""
+import logging
+import threading
+import time
+
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# name -> dotted path of a zero-argument loader
+MODEL_LOADERS = {
+    'category_classifier': 'job_recommendation.model.recommender.load_category_classifier',
+    'sentence_transformer': 'job_recommendation.model2_reccomender.eish.load_sentence_transformer',
+}
+
+_models = {}
+_load_seconds = {}
+_locks = {name: threading.Lock() for name in MODEL_LOADERS}
+
+
+def get(name):
+    """Return the loaded model registered under name, loading it if needed."""
+    model = _models.get(name)
+    if model is not None:
+        return model
+    with _locks[name]:
+        if name not in _models:
+            started = time.perf_counter()
+            _models[name] = import_string(MODEL_LOADERS[name])()
+            _load_seconds[name] = time.perf_counter() - started
+            logger.info(f"Loaded model '{name}' in {_load_seconds[name]:.2f}s")
+    return _models[name]
+
+
+def is_loaded(name):
+    return name in _models
+
+
+def warm_up(names=None):
+    """Load the given models (default: all registered ones) ahead of time and log what it cost."""
+    names = list(names or MODEL_LOADERS)
+    for name in names:
+        get(name)
+    times = load_times()
+    summary = ', '.join(f"{name} {times[name]:.2f}s" for name in names if name in times)
+    logger.info(f"Models warmed up: {summary or 'all already loaded'}")
+    return times
+
+
+def load_times():
+    """Seconds spent loading each model in this process, including imports."""
+    return dict(_load_seconds)
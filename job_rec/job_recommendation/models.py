@@ -1,5 +1,8 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 
 # class JobCategory(models.Model):
 #     name = models.CharField(max_length=100)
@@ -51,6 +54,8 @@ class Job(models.Model):
     class Meta:
         db_table = 'jobs'
         managed = True
+        # Scraped jobs are upserted on url (see scraper/ingest.py)
+        constraints = [models.UniqueConstraint(fields=['url'], name='unique_url')]
 
 # --- New models for job seeker functionalities ---
 
@@ -106,10 +111,45 @@ class JobCleaned(models.Model):
     source = models.CharField(max_length=100)
     description = models.TextField()
     category = models.CharField(max_length=100)
+    # Source row in jobs (empty for jobs posted through post_job) and the md5 of
+    # that row when it was categorized, so only new or changed jobs are reclassified
+    job = models.OneToOneField('Job', on_delete=models.SET_NULL, null=True, blank=True, related_name='cleaned')
+    source_hash = models.CharField(max_length=32, blank=True, default='')
+    # Font Awesome icon class derived from the title when the row is written (see display.py)
+    icon = models.CharField(max_length=50, blank=True, default='')
+    # Weighted full-text document for job_list search (see search.py), kept up
+    # to date by Postgres on every write, including the categorizer's raw upserts
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('title', weight='A', config='english')
+            + SearchVector('company', weight='B', config='english')
+            + SearchVector('description', weight='C', config='english')
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
 
     class Meta:
         db_table = 'jobs_cleaned'
         managed = True
+        indexes = [
+            GinIndex(fields=['search_vector'], name='jobs_cleaned_search_idx'),
+            # Newest-first listing pages (see listing.py)
+            models.Index(fields=['-date_posted', '-id'], name='jobs_cleaned_listing_idx'),
+        ]
+
+class JobEmbedding(models.Model):
+    # Cached SentenceTransformer vector for a JobCleaned row. content_hash covers
+    # the embedded text (title + category) and the model name, so a stale row is
+    # detected by comparing hashes rather than timestamps.
+    job = models.OneToOneField('JobCleaned', on_delete=models.CASCADE, primary_key=True, related_name='embedding')
+    content_hash = models.CharField(max_length=64)
+    vector = models.BinaryField()  # float32 bytes
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'job_embeddings'
+        managed = True
 
 class Recruiter(models.Model):
     id = models.AutoField(primary_key=True)
@@ -156,4 +196,38 @@ class MatchedJob(models.Model):
 
     class Meta:
         db_table = 'matched_jobs'
-        unique_together = ('user_id', 'job_id')
\ No newline at end of file
+        unique_together = ('user_id', 'job_id')
+
+class MatchRefreshRequest(models.Model):
+    # Pending match recomputation for a user, drained by the process_match_queue
+    # command. One row per user: enqueueing again just bumps requested_at.
+    user_id = models.IntegerField(unique=True)
+    requested_at = models.DateTimeField(default=timezone.now)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'match_refresh_queue'
+        managed = True
+
+class PipelineRun(models.Model):
+    # One execution of a scheduled pipeline stage ('scrape' per site, then
+    # 'categorize', 'embed', 'match'), kept to track durations over time.
+    # 'skipped' means another process held the stage lock.
+    stage = models.CharField(max_length=50)
+    site = models.CharField(max_length=100, blank=True, default='')
+    status = models.CharField(max_length=20, default='running')
+    started_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    items = models.IntegerField(null=True, blank=True)
+    error = models.TextField(blank=True, default='')
+
+    class Meta:
+        db_table = 'pipeline_runs'
+        managed = True
+        indexes = [models.Index(fields=['stage', 'site', '-started_at'])]
+
+    @property
+    def duration(self):
+        if self.finished_at:
+            return self.finished_at - self.started_at
+        return None
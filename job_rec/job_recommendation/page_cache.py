@@ -0,0 +1,135 @@
+"""
+Response and fragment caching for the job pages, keyed by a jobs data version.
+
+The pages under @cache_jobs_page (home, category, job_list, job_detail) only
+change when the job tables are written, so their rendered responses are kept in
+the default cache under the current data version and the request path. Writers
+(the categorizer, post_job, scraper ingestion, description enrichment and icon
+backfills) call bump_data_version(), which makes every cached page and fragment
+stale at once; old entries simply expire after PAGE_CACHE_TTL.
+
+Only URLs without a query string, or with just the query parameters a view
+allows (job_list: category), are cached. Free-text searches and keyset pages
+(?q=, ?page=, ?after=, ?before=) are unbounded, so they are always rendered.
+
+The version and the hit/miss counters live in their own cache alias,
+page_cache_meta, which holds only those few keys and so is never culled; page
+entries filling the default cache cannot evict them. With the file backend
+(the default, see CACHES) every gunicorn worker, the scheduler and management
+commands on the host share both caches. With locmem each process keeps its own
+copy, which is only right for a single-process development server. Counters
+are approximate under concurrent requests with the file backend, whose incr()
+is not atomic.
+"""
+import functools
+import hashlib
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.http import HttpResponse
+
+logger = logging.getLogger(__name__)
+
+META_CACHE = 'page_cache_meta'
+VERSION_KEY = 'jobs-data-version'
+STATS_KEY = 'page-cache-stats'
+
+CACHED_VIEWS = []
+
+
+def data_version():
+    """Current jobs data version."""
+    meta = caches[META_CACHE]
+    version = meta.get(VERSION_KEY)
+    if version is None:
+        # Start from the clock so a lost counter never brings back an old version
+        meta.add(VERSION_KEY, time.time_ns(), None)
+        version = meta.get(VERSION_KEY)
+    return version
+
+
+def bump_data_version():
+    """Mark cached pages stale after the job tables changed."""
+    meta = caches[META_CACHE]
+    try:
+        version = meta.incr(VERSION_KEY)
+    except ValueError:
+        version = time.time_ns()
+        meta.set(VERSION_KEY, version, None)
+    logger.info(f"Jobs data version is now {version}")
+    return version
+
+
+def _count(view, outcome):
+    meta = caches[META_CACHE]
+    key = f'{STATS_KEY}:{view}:{outcome}'
+    try:
+        meta.incr(key)
+    except ValueError:
+        if not meta.add(key, 1, None):
+            meta.incr(key)
+
+
+def stats(views=None):
+    """{view: {'hits', 'misses', 'hit_ratio'}} for views (default: all cached views)."""
+    meta = caches[META_CACHE]
+    result = {}
+    for view in views or CACHED_VIEWS:
+        hits = meta.get(f'{STATS_KEY}:{view}:hit', 0)
+        misses = meta.get(f'{STATS_KEY}:{view}:miss', 0)
+        result[view] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': hits / (hits + misses) if hits + misses else 0.0,
+        }
+    return result
+
+
+def reset_stats():
+    caches[META_CACHE].delete_many(
+        [f'{STATS_KEY}:{view}:{outcome}' for view in CACHED_VIEWS for outcome in ('hit', 'miss')]
+    )
+
+
+def cache_jobs_page(view=None, *, params=()):
+    """
+    Serve GET responses of view from the cache while the data version is
+    unchanged. Requests with a query parameter not in params are not cached.
+    """
+    if view is None:
+        return functools.partial(cache_jobs_page, params=params)
+    name = view.__name__
+    CACHED_VIEWS.append(name)
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if (
+            not settings.PAGE_CACHE_TTL
+            or request.method not in ('GET', 'HEAD')
+            or any(param not in params for param in request.GET)
+        ):
+            return view(request, *args, **kwargs)
+        path = hashlib.md5(request.get_full_path().encode('utf-8')).hexdigest()
+        key = f'page:{data_version()}:{name}:{path}'
+        cached = cache.get(key)
+        if cached is not None:
+            _count(name, 'hit')
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+            response['X-Page-Cache'] = 'hit'
+            return response
+        _count(name, 'miss')
+        response = view(request, *args, **kwargs)
+        if response.status_code == 200 and not response.streaming and not response.cookies:
+            cache.set(key, (response.content, response['Content-Type']), settings.PAGE_CACHE_TTL)
+            response['X-Page-Cache'] = 'miss'
+        return response
+
+    return wrapper
+
+
+def jobs_version(request):
+    """Template context processor: jobs_version, for {% cache %} fragment keys."""
+    return {'jobs_version': data_version, 'page_cache_ttl': settings.PAGE_CACHE_TTL}
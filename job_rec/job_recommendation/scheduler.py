@@ -0,0 +1,227 @@
+"""
+Scheduled scrape -> categorize -> embed -> match pipeline.
+
+Each site is scraped in its own window (SCRAPER_SCHEDULE_START, then one site
+every SCRAPER_SCHEDULE_STAGGER_MINUTES), and the remaining stages run once at
+PIPELINE_SCHEDULE_TIME. Every stage holds a lock for its duration: a Postgres
+advisory lock, or a file lock on other databases. A run that finds its stage
+locked is recorded as skipped instead of overlapping the one in progress.
+Jobs missed while the scheduler was down are run once on start-up if they are
+within SCHEDULER_MISFIRE_GRACE seconds, and APScheduler coalesces repeated
+misfires into one run. Every stage run is recorded in the pipeline_runs table.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+TIMEZONE = "Africa/Blantyre"
+
+
+@contextmanager
+def stage_lock(name):
+    """Try to take the lock for stage name; yields whether it was acquired."""
+    if connection.vendor == 'postgresql':
+        key = int.from_bytes(hashlib.blake2b(name.encode(), digest_size=8).digest(), 'big', signed=True)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_try_advisory_lock(%s)", [key])
+            acquired = cursor.fetchone()[0]
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT pg_advisory_unlock(%s)", [key])
+    else:
+        from filelock import FileLock, Timeout
+
+        os.makedirs(settings.SCRAPER_STATE_DIR, exist_ok=True)
+        lock = FileLock(os.path.join(settings.SCRAPER_STATE_DIR, f"{name.replace(':', '_')}.lock"))
+        try:
+            lock.acquire(timeout=0)
+        except Timeout:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            lock.release()
+
+
+def run_stage(stage, func, site=''):
+    """
+    Run func() under the stage lock and record it in pipeline_runs. func
+    returns the number of items it processed. Returns the PipelineRun.
+    """
+    from job_recommendation.models import PipelineRun
+
+    close_old_connections()
+    try:
+        with stage_lock(f"{stage}:{site}" if site else stage) as acquired:
+            if not acquired:
+                logger.warning(f"Stage {stage} {site} is already running elsewhere, skipping")
+                return PipelineRun.objects.create(stage=stage, site=site, status='skipped', finished_at=timezone.now())
+            run = PipelineRun.objects.create(stage=stage, site=site)
+            try:
+                run.items = func()
+                run.status = 'ok'
+            except Exception as e:
+                logger.exception(f"Stage {stage} {site} failed")
+                run.status = 'failed'
+                run.error = str(e)
+            run.finished_at = timezone.now()
+            run.save(update_fields=['items', 'status', 'error', 'finished_at'])
+            logger.info(f"Stage {stage} {site}: {run.status} in {run.duration.total_seconds():.1f}s")
+            return run
+    finally:
+        close_old_connections()
+
+
+def scrape_sites_locked(sites):
+    """
+    Scrape sites concurrently through run_scrapers.scrape_sites, each under
+    its own scrape stage lock, recording one pipeline_runs row per site. Sites
+    whose lock is held elsewhere are recorded as skipped and left out.
+    Returns the PipelineRun of each site, in the order given.
+    """
+    from job_recommendation.models import PipelineRun
+
+    close_old_connections()
+    try:
+        with ExitStack() as locks:
+            runs = {}
+            for site in sites:
+                if locks.enter_context(stage_lock(f"scrape:{site}")):
+                    runs[site] = PipelineRun.objects.create(stage='scrape', site=site)
+                else:
+                    logger.warning(f"Stage scrape {site} is already running elsewhere, skipping")
+                    runs[site] = PipelineRun.objects.create(
+                        stage='scrape', site=site, status='skipped', finished_at=timezone.now()
+                    )
+            running = [site for site in sites if runs[site].status == 'running']
+            if running:
+                _scrape(running, runs)
+            return [runs[site] for site in sites]
+    finally:
+        close_old_connections()
+
+
+def _scrape(sites, runs):
+    from job_recommendation.scraper.descriptions import enrich_descriptions
+    from job_recommendation.scraper.run_scrapers import scrape_sites
+
+    async def scrape():
+        jobs, reports = await scrape_sites(sites)
+        if settings.SCRAPER_FETCH_DESCRIPTIONS:
+            await enrich_descriptions(job for job in jobs if job["description"] == "N/A")
+        return reports
+
+    try:
+        reports = asyncio.run(scrape())
+    except Exception as e:
+        logger.exception(f"Scraping {', '.join(sites)} failed")
+        reports = [{"site": site, "status": "failed", "jobs": 0, "error": str(e)} for site in sites]
+    for report in reports:
+        run = runs[report["site"]]
+        run.items = report["jobs"]
+        run.status = 'ok' if report["status"] == "ok" else 'failed'
+        if run.status == 'failed':
+            run.error = report.get("error") or f"{run.site} scraper {report['status']}"
+        run.finished_at = timezone.now()
+        run.save(update_fields=['items', 'status', 'error', 'finished_at'])
+        logger.info(f"Stage scrape {run.site}: {run.status} in {run.duration.total_seconds():.1f}s")
+
+
+def scrape_site(site):
+    return scrape_sites_locked([site])[0]
+
+
+def process_jobs(incremental=True):
+    """
+    Categorize, embed and match, stopping at the first stage that does not
+    succeed. Returns the PipelineRun of each stage that ran or was skipped.
+    """
+    from job_recommendation.model.categorizer import categorize_jobs_streaming
+    from job_recommendation.model2_reccomender.eish import save_matches_for_users
+    from job_recommendation.model2_reccomender.embedding_store import sync_job_embeddings
+    from job_recommendation.model2_reccomender.job_index import build_job_index, get_job_index
+
+    def embed():
+        count = sync_job_embeddings()
+        index = get_job_index()
+        if index is None or index.needs_rebuild():
+            build_job_index()
+        return count
+
+    stages = [
+        ('categorize', lambda: categorize_jobs_streaming(incremental=incremental)),
+        ('embed', embed),
+        ('match', lambda: len(save_matches_for_users(None, top_n=6))),
+    ]
+    runs = []
+    for stage, func in stages:
+        runs.append(run_stage(stage, func))
+        if runs[-1].status != 'ok':
+            break
+    return runs
+
+
+def schedule():
+    """(job id, function, args, hour, minute) for every scheduled job."""
+    from job_recommendation.scraper.run_scrapers import SCRAPERS
+
+    start = datetime.strptime(settings.SCRAPER_SCHEDULE_START, "%H:%M")
+    jobs = []
+    for i, site in enumerate(SCRAPERS):
+        at = start + timedelta(minutes=i * settings.SCRAPER_SCHEDULE_STAGGER_MINUTES)
+        jobs.append((f"scrape:{site}", scrape_site, [site], at.hour, at.minute))
+    at = datetime.strptime(settings.PIPELINE_SCHEDULE_TIME, "%H:%M")
+    jobs.append(("process", process_jobs, [], at.hour, at.minute))
+    return jobs
+
+
+def _missed(job_id, hour, minute, now):
+    """Whether the last scheduled run of job_id (within the misfire grace) never started."""
+    from job_recommendation.models import PipelineRun
+
+    due = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if due > now:
+        due -= timedelta(days=1)
+    if now - due > timedelta(seconds=settings.SCHEDULER_MISFIRE_GRACE):
+        return False
+    stage, _, site = job_id.partition(':')
+    stage = 'categorize' if stage == 'process' else stage
+    return not PipelineRun.objects.filter(stage=stage, site=site, started_at__gte=due).exists()
+
+
+def build_scheduler(scheduler_class=None):
+    """Scheduler with every pipeline job added (BlockingScheduler by default); not started."""
+    from apscheduler.schedulers.blocking import BlockingScheduler
+    from zoneinfo import ZoneInfo
+
+    tz = ZoneInfo(TIMEZONE)
+    scheduler = (scheduler_class or BlockingScheduler)(
+        timezone=tz,
+        job_defaults={
+            'coalesce': True,
+            'max_instances': 1,
+            'misfire_grace_time': settings.SCHEDULER_MISFIRE_GRACE,
+        },
+    )
+    now = datetime.now(tz)
+    for job_id, func, args, hour, minute in schedule():
+        extra = {}
+        if _missed(job_id, hour, minute, now):
+            logger.info(f"Catching up on missed run of {job_id}")
+            extra['next_run_time'] = now
+        scheduler.add_job(func, 'cron', args=args, id=job_id, hour=hour, minute=minute, **extra)
+        logger.info(f"Scheduled {job_id} daily at {hour:02d}:{minute:02d} {TIMEZONE}")
+    return scheduler
@@ -0,0 +1,159 @@
+"""
+Shared pool of Chrome drivers for the Selenium fetcher.
+
+Instead of every scraper starting and quitting its own browser, drivers are
+started on demand up to SCRAPER_BROWSERS per set of options and leased out one
+page load at a time. A driver is replaced after SCRAPER_BROWSER_MAX_PAGES page
+loads, or straight away if it crashes. run_scrapers closes the pools when the
+scrape step ends. A closed pool starts no more drivers, and drivers still
+leased when it closed (e.g. by a scraper that timed out) are quit as soon as
+their lease ends.
+"""
+import atexit
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.7103.94 Safari/537.36"
+
+
+class BrowserPool:
+    def __init__(self, size, max_pages, headless=True, proxy=None):
+        self.size = size
+        self.max_pages = max_pages
+        self.headless = headless
+        self.proxy = proxy
+        self.idle = queue.LifoQueue()
+        self.pages = {}  # driver -> pages loaded
+        self.starting = 0
+        self.closed = False
+        self.lock = threading.Lock()
+
+    def _start(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        chrome_options = Options()
+        if self.headless:
+            chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument(f"user-agent={USER_AGENT}")
+        if self.proxy:
+            chrome_options.add_argument(f"--proxy-server={self.proxy}")
+        return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+
+    def _acquire(self):
+        while True:
+            try:
+                return self.idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self.lock:
+                if self.closed:
+                    raise RuntimeError("Browser pool is closed")
+                start = len(self.pages) + self.starting < self.size
+                if start:
+                    self.starting += 1
+            if start:
+                try:
+                    driver = self._start()
+                finally:
+                    with self.lock:
+                        self.starting -= 1
+                with self.lock:
+                    self.pages[driver] = 0
+                    closed = self.closed
+                if closed:
+                    self._discard(driver)
+                    raise RuntimeError("Browser pool is closed")
+                logger.info(f"Started browser {len(self.pages)}/{self.size}")
+                return driver
+            # Wait for a lease to end; re-check capacity in case a driver was discarded
+            try:
+                return self.idle.get(timeout=1)
+            except queue.Empty:
+                pass
+
+    def _discard(self, driver):
+        with self.lock:
+            self.pages.pop(driver, None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @contextmanager
+    def lease(self):
+        """Borrow a driver for one page load."""
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+
+        driver = self._acquire()
+        try:
+            yield driver
+        except TimeoutException:
+            # The page was slow, the browser is fine
+            self._release(driver)
+            raise
+        except WebDriverException:
+            logger.warning("Browser crashed, replacing it")
+            self._discard(driver)
+            raise
+        except BaseException:
+            self._release(driver)
+            raise
+        else:
+            self._release(driver)
+
+    def _release(self, driver):
+        with self.lock:
+            self.pages[driver] += 1
+            worn_out = self.pages[driver] >= self.max_pages
+            keep = not worn_out and not self.closed
+            if keep:
+                # Under the lock, so close() cannot miss a driver returned while it drains
+                self.idle.put(driver)
+        if worn_out:
+            logger.info(f"Recycling browser after {self.max_pages} pages")
+        if not keep:
+            self._discard(driver)
+
+    def close(self):
+        """Quit the idle drivers now and every leased driver when its lease ends."""
+        with self.lock:
+            self.closed = True
+        while True:
+            try:
+                self._discard(self.idle.get_nowait())
+            except queue.Empty:
+                break
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_browser_pool(headless=True, proxy=None):
+    """The shared pool for these Chrome options."""
+    with _pools_lock:
+        key = (headless, proxy)
+        if key not in _pools:
+            _pools[key] = BrowserPool(
+                settings.SCRAPER_BROWSERS, settings.SCRAPER_BROWSER_MAX_PAGES, headless=headless, proxy=proxy
+            )
+        return _pools[key]
+
+
+@atexit.register
+def close_browser_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
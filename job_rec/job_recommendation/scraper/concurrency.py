@@ -0,0 +1,54 @@
+"""
+Concurrency limits for the site scrapers.
+
+Selenium and BeautifulSoup calls block, so scrapers hand them to run_blocking(),
+which runs them on a bounded thread pool. Each call holds a slot from a global
+semaphore (SCRAPER_MAX_CONCURRENCY) and from a per-site one
+(SCRAPER_SITE_CONCURRENCY), so one slow site cannot take every worker while
+the event loop stays free to drive the other scrapers.
+"""
+import asyncio
+import functools
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from django.conf import settings
+
+_executor = None
+# Semaphores belong to an event loop; the scheduler starts a new one per run.
+_limits = weakref.WeakKeyDictionary()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.SCRAPER_MAX_CONCURRENCY,
+            thread_name_prefix='scraper',
+        )
+    return _executor
+
+
+def _semaphores():
+    loop = asyncio.get_running_loop()
+    if loop not in _limits:
+        _limits[loop] = {'*': asyncio.Semaphore(settings.SCRAPER_MAX_CONCURRENCY)}
+    return _limits[loop]
+
+
+@asynccontextmanager
+async def slot(site):
+    """Hold a global and a per-site concurrency slot."""
+    semaphores = _semaphores()
+    if site not in semaphores:
+        semaphores[site] = asyncio.Semaphore(settings.SCRAPER_SITE_CONCURRENCY)
+    async with semaphores['*'], semaphores[site]:
+        yield
+
+
+async def run_blocking(site, func, *args, **kwargs):
+    """Run func(*args, **kwargs) on the scraper thread pool under site's limits."""
+    async with slot(site):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), functools.partial(func, *args, **kwargs))
@@ -0,0 +1,164 @@
+"""
+Description enrichment for scraped jobs.
+
+Listing pages only give title/company/location, so scrapers store
+description = "N/A" and the categorizer and matcher fall back to the title.
+enrich_descriptions() fetches the detail page of each job with a pool of
+SCRAPER_DETAIL_WORKERS async workers, spacing requests to the same host by
+SCRAPER_HOST_INTERVAL seconds and retrying failures with backoff. The extracted
+text is written back to jobs.description in bulk.
+"""
+import asyncio
+import logging
+import re
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+from asgiref.sync import sync_to_async
+from bs4 import BeautifulSoup
+from django.conf import settings
+from django.db import connection
+from psycopg2.extras import execute_values
+
+from job_recommendation.page_cache import bump_data_version
+from job_recommendation.scraper.concurrency import run_blocking
+from job_recommendation.scraper.fetchers import HttpFetcher
+from job_recommendation.scraper.ingest import normalize_url
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRIES = 3
+MAX_LENGTH = 10000
+UPDATE_BATCH_SIZE = 200
+
+# Tried in order; the first match holds the description
+DESCRIPTION_SELECTORS = {
+    "ntchito.com": ["div.entry-content", "div.job-description"],
+    "jobsearchmalawi.com": ["div.job-description", "div.job_description", "div.entry-content"],
+    "careersmw.com": ["div.job-description", "div.job_description", "div.entry-content"],
+}
+DEFAULT_SELECTORS = ["div.job-description", "div.entry-content", "article", "main"]
+
+UPDATE_DESCRIPTIONS_SQL = """
+    UPDATE jobs SET description = v.description
+    FROM (VALUES %s) AS v(url, description)
+    WHERE jobs.url = v.url
+"""
+
+
+def extract_description(html, source):
+    """Normalized description text from a detail page, or None if none was found."""
+    soup = BeautifulSoup(html, "html.parser")
+    for selector in DESCRIPTION_SELECTORS.get(source, []) + DEFAULT_SELECTORS:
+        elem = soup.select_one(selector)
+        if elem is None:
+            continue
+        for tag in elem(["script", "style", "noscript", "form"]):
+            tag.decompose()
+        text = re.sub(r"\s+", " ", elem.get_text(" ")).strip()
+        if text:
+            return text[:MAX_LENGTH]
+    return None
+
+
+class HostThrottle:
+    """Spaces requests to the same host at least interval seconds apart."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.next_allowed = {}
+        self.locks = defaultdict(asyncio.Lock)
+
+    async def wait(self, url):
+        host = urlsplit(url).netloc
+        async with self.locks[host]:
+            now = time.monotonic()
+            delay = self.next_allowed.get(host, 0) - now
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.next_allowed[host] = max(now, self.next_allowed.get(host, 0)) + self.interval
+
+
+async def _fetch_description(fetcher, throttle, url, source):
+    for attempt in range(1, MAX_RETRIES + 1):
+        await throttle.wait(url)
+        try:
+            html = await fetcher.fetch(url)
+            return await run_blocking(source, extract_description, html, source)
+        except Exception as e:
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            # Client errors other than rate limiting will not go away on retry
+            if attempt == MAX_RETRIES or (status and status < 500 and status != 429):
+                logger.warning(f"Giving up on description for {url}: {e}")
+                return None
+            await asyncio.sleep(2 ** attempt)
+
+
+def update_descriptions(descriptions):
+    """Write {url: description} to jobs in batches; returns rows updated."""
+    updated = 0
+    rows = list(descriptions.items())
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), UPDATE_BATCH_SIZE):
+            batch = rows[start:start + UPDATE_BATCH_SIZE]
+            execute_values(cursor.cursor, UPDATE_DESCRIPTIONS_SQL, batch, page_size=len(batch))
+            updated += cursor.cursor.rowcount
+    if updated:
+        bump_data_version()
+    return updated
+
+
+async def enrich_descriptions(jobs, workers=None):
+    """
+    Fetch and store descriptions for jobs, an iterable of dicts with "url" and
+    "source". Returns the number of jobs updated.
+    """
+    queue = asyncio.Queue()
+    for job in jobs:
+        url = normalize_url(job.get("url"))
+        if url:
+            queue.put_nowait((url, job.get("source")))
+    if queue.empty():
+        return 0
+
+    started = time.perf_counter()
+    total = queue.qsize()
+    throttle = HostThrottle(settings.SCRAPER_HOST_INTERVAL)
+    fetchers = {}
+    descriptions = {}
+
+    async def worker():
+        while True:
+            try:
+                url, source = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            if source not in fetchers:
+                fetchers[source] = HttpFetcher(source)
+            description = await _fetch_description(fetchers[source], throttle, url, source)
+            if description:
+                descriptions[url] = description
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(min(workers or settings.SCRAPER_DETAIL_WORKERS, total))))
+    finally:
+        for fetcher in fetchers.values():
+            await fetcher.close()
+
+    updated = await sync_to_async(update_descriptions)(descriptions) if descriptions else 0
+    logger.info(
+        f"Fetched {len(descriptions)} of {total} job descriptions in {time.perf_counter() - started:.1f}s, "
+        f"updated {updated} jobs"
+    )
+    return updated
+
+
+def jobs_missing_descriptions(source=None, limit=None):
+    """Jobs still stored with description "N/A", newest first."""
+    from job_recommendation.models import Job
+
+    jobs = Job.objects.filter(description="N/A").order_by("-id")
+    if source:
+        jobs = jobs.filter(source=source)
+    return list(jobs.values("url", "source")[:limit])
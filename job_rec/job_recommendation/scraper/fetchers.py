@@ -0,0 +1,242 @@
+"""
+Page fetchers for the site scrapers.
+
+A fetcher turns a URL into page HTML; scrapers only parse what it returns.
+
+- HttpFetcher:     plain HTTP through a pooled keep-alive requests.Session
+                   (gzip/deflate are negotiated and decoded by requests),
+                   with conditional requests against a ResponseCache.
+- SeleniumFetcher: Chrome from the shared browser pool, for pages that only
+                   render with JS.
+- FallbackFetcher: try one fetcher, use another when the page is not ready.
+- FixtureFetcher:  replay saved HTML, e.g. the *_final_page_source.html dumps.
+
+fetch() returns None when the page is unchanged since it was last processed;
+callers skip it and call commit() once they have saved what they parsed.
+get_fetcher() builds the one selected by SCRAPER_FETCHER. Blocking work goes
+through run_blocking(), so fetches count against the scraper concurrency limits.
+"""
+import logging
+import os
+import re
+
+from django.conf import settings
+
+from job_recommendation.scraper import response_cache
+from job_recommendation.scraper.browser_pool import USER_AGENT, get_browser_pool
+from job_recommendation.scraper.concurrency import run_blocking
+
+logger = logging.getLogger(__name__)
+
+class Fetcher:
+    def __init__(self, site):
+        self.site = site
+
+    async def fetch(self, url):
+        """Return the HTML of url, or None if it has not changed since the last commit()."""
+        raise NotImplementedError
+
+    async def commit(self):
+        """Record the pages fetched so far as processed."""
+
+    async def close(self):
+        pass
+
+
+class HttpFetcher(Fetcher):
+    """
+    With ready (see FallbackFetcher), a page that is not ready is always
+    returned as is, never reported as unchanged nor committed to the cache, so
+    the fallback renders it again on every run.
+    """
+
+    def __init__(self, site, timeout=20, proxy=None, cache=None, ready=None):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        super().__init__(site)
+        self.timeout = timeout
+        self.cache = cache
+        self.ready = ready
+        self._uncommitted = {}
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=settings.SCRAPER_SITE_CONCURRENCY,
+            max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504)),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"User-Agent": USER_AGENT, "Accept-Encoding": "gzip, deflate"})
+        if proxy:
+            self.session.proxies.update({"http": proxy, "https": proxy})
+
+    def _get(self, url):
+        if self.cache is None:
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            return response.text
+
+        meta = self.cache.get(url)
+        response = self.session.get(url, timeout=self.timeout, headers=self.cache.conditional_headers(meta))
+        if response.status_code == 304:
+            if self.ready:
+                # Only ready pages are committed, but an entry may predate that
+                html = self.cache.body(url)
+                if html is None or not self.ready(html):
+                    response_cache.record(self.site, 'not_ready')
+                    return html or ''
+            response_cache.record(self.site, 'not_modified')
+            return None
+        response.raise_for_status()
+        html = response.text
+        if self.ready and not self.ready(html):
+            response_cache.record(self.site, 'not_ready')
+            return html
+        etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+        if meta and meta['body_hash'] == response_cache.body_hash(html):
+            response_cache.record(self.site, 'identical')
+            if (etag, last_modified) != (meta.get('etag'), meta.get('last_modified')):
+                self.cache.put(url, html, etag, last_modified)
+            return None
+        response_cache.record(self.site, 'miss')
+        self._uncommitted[url] = (html, etag, last_modified)
+        return html
+
+    def _commit(self, pages):
+        for url, (html, etag, last_modified) in pages.items():
+            self.cache.put(url, html, etag, last_modified)
+
+    async def fetch(self, url):
+        return await run_blocking(self.site, self._get, url)
+
+    async def commit(self):
+        if self._uncommitted:
+            pages, self._uncommitted = self._uncommitted, {}
+            await run_blocking(self.site, self._commit, pages)
+
+    async def close(self):
+        self.session.close()
+
+
+class SeleniumFetcher(Fetcher):
+    """
+    Loads pages in Chrome drivers leased from the shared browser pool. With
+    SCRAPER_DEBUG_DUMPS on, a failed load leaves a screenshot and the page
+    source behind as <dump_prefix>_error.png / _error_page_source.html.
+    """
+
+    def __init__(self, site, wait_selector, headless=True, proxy=None, dump_prefix=None):
+        super().__init__(site)
+        self.wait_selector = wait_selector
+        self.pool = get_browser_pool(headless=headless, proxy=proxy)
+        self.dump_prefix = dump_prefix
+
+    def _get(self, url):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        with self.pool.lease() as driver:
+            try:
+                driver.get(url)
+                WebDriverWait(driver, 15).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, self.wait_selector))
+                )
+            except Exception:
+                self._dump(driver, "error")
+                raise
+            return driver.page_source
+
+    def _dump(self, driver, suffix):
+        if not (settings.SCRAPER_DEBUG_DUMPS and self.dump_prefix):
+            return
+        try:
+            driver.save_screenshot(f"{self.dump_prefix}_{suffix}.png")
+            with open(f"{self.dump_prefix}_{suffix}_page_source.html", "w", encoding="utf-8") as f:
+                f.write(driver.page_source)
+        except Exception as e:
+            logger.warning(f"Could not save debug dump for {self.site}: {e}")
+
+    async def fetch(self, url):
+        return await run_blocking(self.site, self._get, url)
+
+
+class FallbackFetcher(Fetcher):
+    """
+    Fetch with primary; when it fails or ready(html) is false (e.g. the job list
+    is rendered client-side), fetch the page again with fallback.
+    """
+
+    def __init__(self, primary, fallback, ready):
+        super().__init__(primary.site)
+        self.primary = primary
+        self.fallback = fallback
+        self.ready = ready
+
+    async def fetch(self, url):
+        try:
+            html = await self.primary.fetch(url)
+            if html is None or self.ready(html):
+                return html
+            logger.info(f"{url} has no job listings without JS, falling back to {type(self.fallback).__name__}")
+        except Exception as e:
+            logger.warning(f"{type(self.primary).__name__} failed for {url}: {e}")
+        return await self.fallback.fetch(url)
+
+    async def commit(self):
+        await self.primary.commit()
+        await self.fallback.commit()
+
+    async def close(self):
+        await self.primary.close()
+        await self.fallback.close()
+
+
+def fixture_name(url):
+    """File name a page is saved under for FixtureFetcher, e.g. ntchito_com_page_2.html."""
+    return re.sub(r"[^a-z0-9]+", "_", re.sub(r"^https?://", "", url.lower())).strip("_") + ".html"
+
+
+class FixtureFetcher(Fetcher):
+    """
+    Serve pages from directory: fixture_name(url) if it exists, else default
+    (a file name in directory, such as ntchito_final_page_source.html).
+    """
+
+    def __init__(self, site, directory, default=None):
+        super().__init__(site)
+        self.directory = directory
+        self.default = default
+
+    def _read(self, url):
+        path = os.path.join(self.directory, fixture_name(url))
+        if not os.path.exists(path) and self.default:
+            path = os.path.join(self.directory, self.default)
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    async def fetch(self, url):
+        return await run_blocking(self.site, self._read, url)
+
+
+def has_class(*classes):
+    """Cheap ready() check: does the HTML contain an element with one of classes?"""
+    pattern = re.compile(r"""class=["'][^"']*\b(?:%s)\b""" % "|".join(map(re.escape, classes)))
+    return lambda html: bool(pattern.search(html))
+
+
+def get_fetcher(site, wait_selector, ready, headless=True, proxy=None, dump_prefix=None):
+    """
+    Fetcher for site per SCRAPER_FETCHER: 'http' (HTTP with Selenium fallback),
+    'selenium', or 'fixtures' (replay from SCRAPER_FIXTURE_DIR).
+    """
+    mode = settings.SCRAPER_FETCHER
+    if mode == "fixtures":
+        return FixtureFetcher(site, settings.SCRAPER_FIXTURE_DIR, default=f"{dump_prefix}_final_page_source.html")
+    selenium = SeleniumFetcher(site, wait_selector, headless=headless, proxy=proxy, dump_prefix=dump_prefix)
+    if mode == "selenium":
+        return selenium
+    cache = response_cache.ResponseCache() if settings.SCRAPER_HTTP_CACHE else None
+    return FallbackFetcher(HttpFetcher(site, proxy=proxy, cache=cache, ready=ready), selenium, ready)
@@ -0,0 +1,137 @@
+"""
+Bulk ingestion of scraped jobs into the jobs table.
+
+JobSink buffers scraped jobs, drops duplicates by normalized URL, and writes
+each batch with a single INSERT ... ON CONFLICT (url) DO UPDATE. A conflicting
+row is only rewritten when one of its fields actually changed, and a scraped
+"N/A" description never replaces a real one. date_posted is left as first
+seen, so re-scraping a posting does not make it look changed downstream.
+"""
+import logging
+import time
+from collections import Counter
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.utils import timezone
+from psycopg2.extras import execute_values
+
+from job_recommendation.page_cache import bump_data_version
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+FIELDS = ('title', 'company', 'location', 'job_type', 'date_posted', 'url', 'source', 'description')
+
+UPSERT_JOBS_SQL = """
+    INSERT INTO jobs (title, company, location, job_type, date_posted, url, source, description, created_at)
+    VALUES %s
+    ON CONFLICT (url) DO UPDATE
+    SET title = EXCLUDED.title, company = EXCLUDED.company, location = EXCLUDED.location,
+        job_type = EXCLUDED.job_type, source = EXCLUDED.source,
+        description = CASE WHEN EXCLUDED.description = 'N/A' THEN jobs.description ELSE EXCLUDED.description END
+    WHERE (jobs.title, jobs.company, jobs.location, jobs.job_type, jobs.source)
+              IS DISTINCT FROM (EXCLUDED.title, EXCLUDED.company, EXCLUDED.location, EXCLUDED.job_type, EXCLUDED.source)
+       OR (EXCLUDED.description <> 'N/A' AND jobs.description IS DISTINCT FROM EXCLUDED.description)
+    RETURNING (xmax = 0) AS inserted
+"""
+
+_TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid')
+
+
+def normalize_url(url):
+    """
+    Canonical form used for dedup: no fragment or tracking params, lowercase
+    scheme and host. Stored URLs are in this form (migration 0011 rewrote the
+    older rows), so a change here needs a data migration as well.
+    """
+    if not url:
+        return None
+    parts = urlsplit(url.strip())
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not k.startswith(_TRACKING_PARAMS)]
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, urlencode(query), ''))
+
+
+def _max_lengths():
+    from job_recommendation.models import Job
+
+    return {name: Job._meta.get_field(name).max_length for name in FIELDS}
+
+
+class JobSink:
+    """
+    Collects scraped job dicts and writes them in batches. add() flushes
+    automatically every batch_size unique jobs; call flush() at the end.
+    totals accumulates the counts of every batch.
+    """
+
+    def __init__(self, batch_size=BATCH_SIZE):
+        self.batch_size = batch_size
+        self.pending = {}
+        self.seen = set()
+        self.skipped = 0
+        self.totals = Counter()
+        self.max_lengths = _max_lengths()
+
+    def add(self, job):
+        url = normalize_url(job.get('url'))
+        if not url or url in self.seen:
+            self.skipped += 1
+            return
+        self.seen.add(url)
+        self.pending[url] = job
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def _row(self, url, job):
+        values = []
+        for name in FIELDS:
+            value = url if name == 'url' else job.get(name)
+            if isinstance(value, str) and self.max_lengths[name]:
+                value = value[:self.max_lengths[name]]
+            values.append(value)
+        values[FIELDS.index('description')] = values[FIELDS.index('description')] or 'N/A'
+        return (*values, timezone.now())
+
+    def flush(self):
+        """Write buffered jobs; returns this batch's inserted/updated/skipped counts."""
+        rows = [self._row(url, job) for url, job in self.pending.items()]
+        counts = Counter(inserted=0, updated=0, skipped=self.skipped)
+        self.pending, self.skipped = {}, 0
+        if rows:
+            started = time.perf_counter()
+            with connection.cursor() as cursor:
+                results = execute_values(cursor.cursor, UPSERT_JOBS_SQL, rows, page_size=len(rows), fetch=True)
+            inserted = sum(1 for (was_inserted,) in results if was_inserted)
+            counts.update(inserted=inserted, updated=len(results) - inserted, skipped=len(rows) - len(results))
+            logger.info(
+                f"Wrote {len(rows)} jobs in {time.perf_counter() - started:.3f}s: "
+                f"{counts['inserted']} inserted, {counts['updated']} updated, {counts['skipped']} skipped"
+            )
+        self.totals.update(counts)
+        return dict(counts)
+
+
+def ingest_jobs(jobs, batch_size=BATCH_SIZE):
+    """Write jobs through a JobSink; returns the total inserted/updated/skipped counts."""
+    sink = JobSink(batch_size)
+    for job in jobs:
+        sink.add(job)
+    sink.flush()
+    if sink.totals['inserted'] or sink.totals['updated']:
+        bump_data_version()
+    return {key: sink.totals[key] for key in ('inserted', 'updated', 'skipped')}
+
+
+async def save_jobs(jobs, source):
+    """Ingest one scraper's jobs from async code and log the outcome."""
+    if not jobs:
+        logger.info(f"No new jobs were scraped from {source} to save.")
+        return {'inserted': 0, 'updated': 0, 'skipped': 0}
+    counts = await sync_to_async(ingest_jobs)(jobs)
+    logger.info(
+        f"Saved jobs from {source} to database: {counts['inserted']} new, "
+        f"{counts['updated']} updated, {counts['skipped']} skipped"
+    )
+    return counts
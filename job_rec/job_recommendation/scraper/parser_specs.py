@@ -0,0 +1,216 @@
+"""
+Declarative listing-page specs for the site scrapers.
+
+A spec names the CSS selectors for job cards ("listing": the first selector
+that matches anything wins) and, per field, the selectors to try inside a card
+in order. A field can instead reuse the element matched for another field
+("same_as"), read an attribute instead of the text ("attr"), fall back to a
+default, or be "required" (cards without it are skipped). "normalize" names a
+function from NORMALIZERS applied to the value.
+
+compile_spec() turns a spec into an Extractor bound to the fastest available
+parser: selectolax (lexbor), then lxml + cssselect, then BeautifulSoup with the
+built-in html.parser. Selectors are compiled once per extractor where the
+backend supports it. selectolax, lxml and cssselect are optional; install them
+from requirements-optional.txt.
+"""
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+NORMALIZERS = {
+    "strip": str.strip,
+    "collapse": lambda value: re.sub(r"\s+", " ", value).strip(),
+}
+
+_LISTING = ["article.job-card", "div.job-listing", "li.job"]
+_JOB_CARD_FIELDS = {
+    "title": {"selectors": ["a.job-card-title", "a.title", "a[href]"], "default": "N/A"},
+    "url": {"same_as": "title", "attr": "href"},
+    "company": {"selectors": ["span.job-card-company", "span.company"], "default": "N/A"},
+    "location": {"selectors": ["li.job-card-location", "span.location"], "default": "N/A"},
+    "job_type": {"selectors": ["li.job-card-type", "span.job-type"], "default": "N/A"},
+}
+
+SITE_SPECS = {
+    "ntchito.com": {
+        "listing": ["article.post", "div.job-listing", "li.job"],
+        "fields": {
+            "title": {"selectors": ["h2.entry-title a", "a.title", "a[href]"], "required": True},
+            "url": {"same_as": "title", "attr": "href"},
+            "company": {"selectors": ["span.company"], "default": "N/A"},
+            "location": {"selectors": ["span.location"], "default": "N/A"},
+            "job_type": {"selectors": ["span.job-type"], "default": "N/A"},
+        },
+    },
+    "jobsearchmalawi.com": {"listing": _LISTING, "fields": _JOB_CARD_FIELDS},
+    "careersmw.com": {"listing": _LISTING, "fields": _JOB_CARD_FIELDS},
+}
+
+
+class _SelectolaxBackend:
+    name = "selectolax"
+
+    def __init__(self):
+        try:
+            from selectolax.lexbor import LexborHTMLParser
+        except ImportError:
+            from selectolax.parser import HTMLParser as LexborHTMLParser
+        self.parser = LexborHTMLParser
+
+    def compile(self, selector):
+        return selector
+
+    def parse(self, html):
+        return self.parser(html)
+
+    def select(self, node, selector):
+        return node.css(selector)
+
+    def select_one(self, node, selector):
+        return node.css_first(selector)
+
+    def text(self, node):
+        return node.text()
+
+    def attr(self, node, name):
+        return node.attributes.get(name)
+
+
+class _LxmlBackend:
+    name = "lxml"
+
+    def __init__(self):
+        import lxml.html
+        from lxml.cssselect import CSSSelector
+        self.fromstring = lxml.html.fromstring
+        self.CSSSelector = CSSSelector
+        # Pages arrive already decoded, so ignore any <?xml encoding=...?> or
+        # <meta charset> they declare (lxml rejects str input with the former)
+        self.parser = lxml.html.HTMLParser(encoding="utf-8")
+
+    def compile(self, selector):
+        return self.CSSSelector(selector)
+
+    def parse(self, html):
+        return self.fromstring(html.encode("utf-8"), parser=self.parser)
+
+    def select(self, node, selector):
+        return selector(node)
+
+    def select_one(self, node, selector):
+        matches = selector(node)
+        return matches[0] if matches else None
+
+    def text(self, node):
+        return node.text_content()
+
+    def attr(self, node, name):
+        return node.get(name)
+
+
+class _SoupBackend:
+    name = "html.parser"
+
+    def __init__(self):
+        from bs4 import BeautifulSoup
+        self.BeautifulSoup = BeautifulSoup
+
+    def compile(self, selector):
+        return selector
+
+    def parse(self, html):
+        return self.BeautifulSoup(html, "html.parser")
+
+    def select(self, node, selector):
+        return node.select(selector)
+
+    def select_one(self, node, selector):
+        return node.select_one(selector)
+
+    def text(self, node):
+        return node.get_text()
+
+    def attr(self, node, name):
+        return node.get(name)
+
+
+BACKENDS = {"selectolax": _SelectolaxBackend, "lxml": _LxmlBackend, "html.parser": _SoupBackend}
+
+
+def available_backends():
+    """Names of the parser backends importable here, fastest first."""
+    names = []
+    for name, backend in BACKENDS.items():
+        try:
+            backend()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+class Extractor:
+    def __init__(self, spec, backend):
+        self.backend = backend
+        self.listing = [backend.compile(selector) for selector in spec["listing"]]
+        self.fields = []
+        for name, field in spec["fields"].items():
+            self.fields.append((
+                name,
+                [backend.compile(selector) for selector in field.get("selectors", [])],
+                field.get("same_as"),
+                field.get("attr"),
+                field.get("default"),
+                field.get("required", False),
+                NORMALIZERS[field.get("normalize", "strip")],
+            ))
+
+    def _first(self, node, selectors):
+        for selector in selectors:
+            match = self.backend.select_one(node, selector)
+            if match is not None:
+                return match
+        return None
+
+    def cards(self, html):
+        if not html or not html.strip():
+            return []
+        root = self.backend.parse(html)
+        for selector in self.listing:
+            cards = self.backend.select(root, selector)
+            if cards:
+                return cards
+        return []
+
+    def extract(self, html):
+        """One dict per job card, with a key per spec field."""
+        records = []
+        for card in self.cards(html):
+            matched, record = {}, {}
+            for name, selectors, same_as, attr, default, required, normalize in self.fields:
+                elem = matched[same_as] if same_as else self._first(card, selectors)
+                matched[name] = elem
+                value = None
+                if elem is not None:
+                    value = self.backend.attr(elem, attr) if attr else self.backend.text(elem)
+                    value = normalize(value) if value is not None else None
+                if value is None and required:
+                    logger.warning(f"Missing {name} element")
+                    record = None
+                    break
+                record[name] = default if value is None else value
+            if record is not None:
+                records.append(record)
+        return records
+
+
+def compile_spec(spec, backend=None):
+    """Extractor for spec on backend (a BACKENDS name; default: the fastest available)."""
+    for name in [backend] if backend else BACKENDS:
+        try:
+            return Extractor(spec, BACKENDS[name]())
+        except ImportError:
+            continue
+    raise ImportError(f"Parser backend {backend} is not installed")
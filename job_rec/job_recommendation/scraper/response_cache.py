@@ -0,0 +1,116 @@
+"""
+On-disk HTTP response cache for the scraper fetch layer.
+
+For every URL it keeps the ETag, Last-Modified and sha256 of the last body the
+scrapers processed (plus the gzipped body itself) under SCRAPER_CACHE_DIR.
+HttpFetcher sends these as a conditional request; a 304, or a 200 whose body
+hashes the same as before, means the page is unchanged and is not parsed again.
+Entries are written only once the scraper has saved what it parsed (commit()),
+so a failed run does not mark its pages as done, and only for pages that were
+usable without JS (see HttpFetcher's ready). The directory is kept under
+SCRAPER_CACHE_MAX_BYTES by evicting least recently used entries.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import Counter, defaultdict
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_stats = defaultdict(Counter)  # site -> not_modified / identical / miss / not_ready counts
+_lock = threading.Lock()
+
+
+def body_hash(body):
+    return hashlib.sha256(body.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or settings.SCRAPER_CACHE_DIR
+        self.max_bytes = max_bytes or settings.SCRAPER_CACHE_MAX_BYTES
+
+    def _paths(self, url):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, key)
+        return f"{base}.json", f"{base}.html.gz"
+
+    def get(self, url):
+        """Cached metadata for url ({'etag', 'last_modified', 'body_hash'}) or None."""
+        meta_path, _ = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        os.utime(meta_path)  # recency for LRU eviction
+        return meta
+
+    def body(self, url):
+        """The cached body of url, or None."""
+        _, body_path = self._paths(url)
+        try:
+            with gzip.open(body_path, 'rt', encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def conditional_headers(self, meta):
+        headers = {}
+        if meta and meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta and meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def put(self, url, body, etag=None, last_modified=None):
+        meta_path, body_path = self._paths(url)
+        meta = {'url': url, 'etag': etag, 'last_modified': last_modified, 'body_hash': body_hash(body)}
+        with _lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with gzip.open(body_path, 'wt', encoding='utf-8') as f:
+                f.write(body)
+            with open(meta_path, 'w') as f:
+                json.dump(meta, f)
+            self._evict()
+
+    def _evict(self):
+        entries = {}
+        for name in os.listdir(self.directory):
+            key = name.split('.', 1)[0]
+            path = os.path.join(self.directory, name)
+            size, mtime = os.path.getsize(path), os.path.getmtime(path)
+            total, latest = entries.get(key, (0, 0))
+            entries[key] = (total + size, max(latest, mtime))
+        used = sum(size for size, _ in entries.values())
+        for key, (size, _) in sorted(entries.items(), key=lambda item: item[1][1]):
+            if used <= self.max_bytes:
+                break
+            for suffix in ('.json', '.html.gz'):
+                try:
+                    os.remove(os.path.join(self.directory, key + suffix))
+                except OSError:
+                    pass
+            used -= size
+
+
+def record(site, outcome):
+    """Count a lookup for site: 'not_modified', 'identical', 'miss' or 'not_ready'."""
+    with _lock:
+        _stats[site][outcome] += 1
+
+
+def stats():
+    """Per-site hit/miss counts for this process."""
+    with _lock:
+        result = {}
+        for site, counts in _stats.items():
+            hits = counts['not_modified'] + counts['identical']
+            lookups = hits + counts['miss']
+            result[site] = dict(counts, hits=hits, hit_ratio=hits / lookups if lookups else 0.0)
+        return result
@@ -1,117 +1,85 @@
-import psycopg2
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 import logging
 import asyncio
+import time
+from django.conf import settings
 # from scrape_jobsearchmalawi import scrape_jobsearchmalawi
 # from scrape_ntchito import scrape_ntchito
 # from scrape_careers import scrape_careersmw
 from job_recommendation.scraper.scrape_jobsearchmalawi import scrape_jobsearchmalawi
 from job_recommendation.scraper.scrape_ntchito import scrape_ntchito
 from job_recommendation.scraper.scrape_careers import scrape_careersmw
+from job_recommendation.scraper import response_cache
+from job_recommendation.scraper.browser_pool import close_browser_pools
+from job_recommendation.scraper.descriptions import enrich_descriptions
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
-# Database connection configuration
-DB_CONFIG = {
-    "dbname": "jb_recommendation_035817",
-    "user": "postgres",
-    "password": "21_21_basi",
-    "host": "localhost",
-    "port": "5433"
+# source -> scraper coroutine
+SCRAPERS = {
+    "jobsearchmalawi.com": scrape_jobsearchmalawi,
+    "ntchito.com": scrape_ntchito,
+    "careersmw.com": scrape_careersmw,
 }
-      
-# Initialize database and create table
-def init_db():
-    try:
-        conn = psycopg2.connect(**DB_CONFIG)
-        cursor = conn.cursor()
-        
-        # Create table if it doesn't exist
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS jobs (
-                id SERIAL PRIMARY KEY,
-                title VARCHAR(255),
-                company VARCHAR(255),
-                location VARCHAR(255),
-                job_type VARCHAR(100),
-                date_posted DATE,
-                url TEXT,
-                source VARCHAR(100),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Check if unique_url constraint exists
-        cursor.execute("""
-            SELECT constraint_name 
-            FROM information_schema.table_constraints 
-            WHERE table_name = 'jobs' AND constraint_type = 'UNIQUE' AND constraint_name = 'unique_url'
-        """)
-        constraint_exists = cursor.fetchone()
-        
-        if not constraint_exists:
-            # Check for duplicates before adding constraint
-            cursor.execute("""
-                SELECT url, COUNT(*) 
-                FROM jobs 
-                GROUP BY url 
-                HAVING COUNT(*) > 1
-            """)
-            duplicates = cursor.fetchall()
-            if duplicates:
-                logger.warning(f"Cannot add unique_url constraint due to {len(duplicates)} duplicate URLs. Please deduplicate the table.")
-                for url, count in duplicates:
-                    logger.warning(f"Duplicate URL: {url} ({count} occurrences)")
-            else:
-                cursor.execute("ALTER TABLE jobs ADD CONSTRAINT unique_url UNIQUE (url)")
-                logger.info("Added unique_url constraint to jobs table")
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-        logger.info("Database initialized successfully")
-    except Exception as e:
-        logger.error(f"Database initialization failed: {e}")
-        raise
 
-async def run_all_scrapers():
-    logger.info("Starting all scrapers")
+async def run_scraper(site, scraper, timeout):
+    """Run one scraper with a timeout; returns (jobs, report)."""
+    started = time.perf_counter()
     jobs = []
-    
-    # Run scrapers sequentially
-    try:
-        jobs.extend(await scrape_jobsearchmalawi())
-        logger.info("Completed jobsearchmalawi.com scraper")
-    except Exception as e:
-        logger.error(f"jobsearchmalawi.com scraper failed: {e}")
-    
     try:
-        jobs.extend(await scrape_ntchito())
-        logger.info("Completed ntchito.com scraper")
-    except Exception as e:
-        logger.error(f"ntchito.com scraper failed: {e}")
-    
+        jobs = await asyncio.wait_for(scraper(), timeout) or []
+        status = "ok"
+    except asyncio.TimeoutError:
+        status = "timeout"
+        logger.error(f"{site} scraper timed out after {timeout}s and was cancelled")
+    except Exception:
+        status = "failed"
+        logger.exception(f"{site} scraper failed")
+    report = {"site": site, "status": status, "jobs": len(jobs), "seconds": time.perf_counter() - started}
+    logger.info(f"{site}: {status}, {report['jobs']} jobs in {report['seconds']:.1f}s")
+    return jobs, report
+
+async def scrape_sites(sites=None, timeout=None):
+    """
+    Run the scrapers for sites (default: all) concurrently, each cancelled
+    after timeout seconds. Returns (jobs, per-site reports).
+    """
+    timeout = timeout or settings.SCRAPER_SITE_TIMEOUT
+    sites = sites or list(SCRAPERS)
+    started = time.perf_counter()
     try:
-        jobs.extend(await scrape_careersmw())
-        logger.info("Completed careersmw.com scraper")
-    except Exception as e:
-        logger.error(f"careersmw.com scraper failed: {e}")
-    
+        results = await asyncio.gather(*(run_scraper(site, SCRAPERS[site], timeout) for site in sites))
+    finally:
+        await asyncio.get_running_loop().run_in_executor(None, close_browser_pools)
+    jobs = [job for site_jobs, _ in results for job in site_jobs]
+    reports = [report for _, report in results]
+    cache_stats = response_cache.stats()
+    for report in reports:
+        report["http_cache"] = cache_stats.get(report["site"], {})
+    logger.info(f"HTTP cache per site: {cache_stats}")
+    logger.info(f"Scraped {len(jobs)} jobs from {len(sites)} sites in {time.perf_counter() - started:.1f}s")
+    return jobs, reports
+
+async def run_all_scrapers():
+    logger.info("Starting all scrapers")
+    jobs, reports = await scrape_sites()
     logger.info(f"Total jobs scraped: {len(jobs)}")
+    if settings.SCRAPER_FETCH_DESCRIPTIONS:
+        # Scrapers only return postings that were new this run
+        await enrich_descriptions(job for job in jobs if job["description"] == "N/A")
     return jobs
 
 async def main(run_scheduler=False):
-    init_db()
     # Run scrapers immediately
     await run_all_scrapers()
     if run_scheduler:
-        # Set up scheduler for daily scraping at 7 AM
-        scheduler = AsyncIOScheduler(timezone="Africa/Blantyre")
-        scheduler.add_job(run_all_scrapers, "cron", hour=7, minute=0)
+        # Staggered per-site scrapes, then categorize/embed/match (see scheduler.py)
+        from job_recommendation.scheduler import build_scheduler
+        scheduler = build_scheduler(AsyncIOScheduler)
         scheduler.start()
-        logger.info("Scheduler started for daily scraping at 7 AM CAT")
+        logger.info("Scheduler started")
         # Keep the event loop running
         try:
             await asyncio.Event().wait()
@@ -1,4 +1,3 @@
-import psycopg2
 from datetime import datetime, timedelta
 import logging
 import asyncio
@@ -6,16 +5,14 @@ import re
 import os
 import django
 from django.conf import settings
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
 from asgiref.sync import sync_to_async
 
+from job_recommendation.scraper.concurrency import run_blocking
+from job_recommendation.scraper.fetchers import get_fetcher, has_class
+from job_recommendation.scraper.ingest import save_jobs
+from job_recommendation.scraper.parser_specs import SITE_SPECS, compile_spec
+from job_recommendation.scraper.seen_urls import SeenUrls
+
 # --- Django Setup ---
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'job_rec.settings')
 django.setup()
@@ -28,112 +25,81 @@ logger = logging.getLogger(__name__)
 # Proxy configuration (optional)
 PROXY = None
 
-@sync_to_async
-def save_job(job):
-    from job_recommendation.models import Job
-    obj, created = Job.objects.get_or_create(
-        url=job.get("url"),
-        defaults={
-            "title": job.get("title"),
-            "company": job.get("company"),
-            "location": job.get("location"),
-            "job_type": job.get("job_type"),
-            "date_posted": job.get("date_posted"),
-            "source": job.get("source"),
-            "description": job.get("description"),
-        }
-    )
-    return created
+# Pagination stops early at the first page with no new postings, so this only
+# bounds the first run, which walks the whole back catalogue
+MAX_PAGES = 50
+
+SOURCE = "ntchito.com"
+EXTRACTOR = compile_spec(SITE_SPECS[SOURCE])
+WAIT_SELECTOR = "article.post, div.job-listing, li.job"
+
+def make_fetcher():
+    return get_fetcher(SOURCE, WAIT_SELECTOR, has_class("post", "job-listing", "job"),
+                       proxy=PROXY, dump_prefix="ntchito")
 
-async def scrape_ntchito():
+def parse_jobs(html, page):
+    jobs = []
+    records = EXTRACTOR.extract(html)
+    logger.info(f"Found {len(records)} job elements on page {page}")
+    if not records:
+        logger.error("No job elements found! Check selector or page structure.")
+    for record in records:
+        try:
+            date_posted = datetime.now().date()
+            job_data = {
+                **record,
+                "date_posted": date_posted,
+                "source": SOURCE,
+                "description": "N/A",
+            }
+            if not job_data["url"]:
+                logger.warning(f"Missing job URL for job: {job_data['title']}")
+            jobs.append(job_data)
+            logger.info(f"Parsed job: {job_data['title']}")
+        except Exception as e:
+            logger.warning(f"Could not parse a job element: {e}")
+    return jobs
+
+async def scrape_ntchito(fetcher=None, save=True):
     print("Current working directory:", os.getcwd())
     base_url = "https://ntchito.com/page/"
     jobs = []
-    
-    # Set up Selenium
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.7103.94 Safari/537.36")
-    if PROXY:
-        chrome_options.add_argument(f"--proxy-server={PROXY}")
-    
-    driver = None
+
+    # Parsing blocks, so it runs on the scraper thread pool like the fetches
+    fetcher = fetcher or make_fetcher()
     try:
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-        for page in range(1, 3): # Scrape the first 2 pages
+        seen = await sync_to_async(SeenUrls(SOURCE, persist=save).load)()
+        for page in range(1, MAX_PAGES + 1):
             url = f"{base_url}{page}/"
             logger.info(f"Scraping ntchito.com page: {url}")
-            driver.get(url)
-            WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "article.post, div.job-listing, li.job"))
-            )
-            soup = BeautifulSoup(driver.page_source, "html.parser")
-            job_elements = soup.select("article.post") or soup.select("div.job-listing") or soup.find_all("li", class_="job")
-            logger.info(f"Found {len(job_elements)} potential job elements on page {page}")
-            if not job_elements:
-                logger.error("No job elements found! Check selector or page structure.")
-            for job_elem in job_elements:
-                try:
-                    title_elem = (job_elem.select_one("h2.entry-title a") or
-                                  job_elem.select_one("a.title") or
-                                  job_elem.find("a", href=True))
-                    if not title_elem:
-                        logger.warning("Missing title element")
-                        continue
-                    title = title_elem.text.strip()
-                    job_url = title_elem['href'] if title_elem and title_elem.has_attr('href') else None
-                    company_elem = (job_elem.select_one("span.company") or
-                                    job_elem.find("span", class_="company"))
-                    company = company_elem.text.strip() if company_elem else "N/A"
-                    location_elem = (job_elem.select_one("span.location") or
-                                     job_elem.find("span", class_="location"))
-                    location = location_elem.text.strip() if location_elem else "N/A"
-                    job_type_elem = (job_elem.select_one("span.job-type") or
-                                     job_elem.find("span", class_="job-type"))
-                    job_type = job_type_elem.text.strip() if job_type_elem else "N/A"
-                    date_posted = datetime.now().date()
-                    job_data = {
-                        "title": title,
-                        "company": company,
-                        "location": location,
-                        "job_type": job_type,
-                        "date_posted": date_posted,
-                        "url": job_url,
-                        "source": "ntchito.com",
-                        "description": "N/A",
-                    }
-                    if not job_url:
-                        logger.warning(f"Missing job URL for job: {title}")
-                    jobs.append(job_data)
-                    logger.info(f"Parsed job: {job_data['title']}")
-                except Exception as e:
-                    logger.warning(f"Could not parse a job element: {e}")
+            try:
+                html = await fetcher.fetch(url)
+            except Exception as e:
+                if page == 1:
+                    raise
+                # Past the last page
+                logger.info(f"Stopping at ntchito.com page {page}: {e}")
+                break
+            if html is None:
+                logger.info(f"ntchito.com page {page} unchanged since last run, stopping")
+                break
+            page_jobs = await run_blocking(SOURCE, parse_jobs, html, page)
+            new_jobs = seen.new_jobs(page_jobs)
+            if not new_jobs:
+                logger.info(f"No new jobs on ntchito.com page {page}, stopping")
+                break
+            jobs.extend(new_jobs)
+            # Replays never persist, so also stop on pages repeated within this run
+            seen.add(job["url"] for job in new_jobs)
         logger.info(f"Jobs list after scraping: {jobs}")
         # --- Save to database ---
-        if jobs:
-            inserted = 0
-            for job in jobs:
-                try:
-                    created = await save_job(job)
-                    if created:
-                        inserted += 1
-                except Exception as e:
-                    logger.warning(f"Failed to insert job {job.get('url')}: {e}")
-            logger.info(f"Saved {inserted} jobs from ntchito.com to database")
-        else:
-            logger.warning("No jobs were scraped from ntchito.com to save.")
+        if save:
+            await save_jobs(jobs, SOURCE)
+            await sync_to_async(seen.save)()
+            await fetcher.commit()
         return jobs
-    
-    except Exception as e:
-        logger.error(f"Selenium scraping failed for ntchito.com: {e}")
-        return []
     finally:
-        if driver:
-            driver.save_screenshot("ntchito_final.png")
-            with open("ntchito_final_page_source.html", "w", encoding="utf-8") as f:
-                f.write(driver.page_source)
-            driver.quit()
+        await fetcher.close()
 
 if __name__ == "__main__":
     asyncio.run(scrape_ntchito())
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""
+Per-site set of job URLs the scrapers have already ingested.
+
+URLs are kept as 64-bit blake2b digests of their normalized form, so a site's
+whole back catalogue fits in a few KB and is stored between runs as
+SCRAPER_STATE_DIR/<site>.seen. Scrapers use it to skip postings they already
+have and to stop paginating once a page holds nothing new. When a site has no
+state file yet, the set is seeded from the URLs already in the jobs table.
+"""
+import hashlib
+import logging
+import os
+from array import array
+
+from django.conf import settings
+
+from job_recommendation.scraper.ingest import normalize_url
+
+logger = logging.getLogger(__name__)
+
+
+def url_digest(url):
+    normalized = normalize_url(url)
+    if not normalized:
+        return None
+    return int.from_bytes(hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class SeenUrls:
+    """
+    Set of URL digests for site. With persist=False it starts empty and is
+    never written, which is what fixture replays use.
+    """
+
+    def __init__(self, site, persist=True):
+        self.site = site
+        self.persist = persist
+        self.path = os.path.join(settings.SCRAPER_STATE_DIR, f"{site}.seen")
+        self.digests = set()
+        self.loaded = not persist
+
+    def load(self):
+        if self.loaded:
+            return self
+        if os.path.exists(self.path):
+            digests = array('Q')
+            with open(self.path, 'rb') as f:
+                digests.frombytes(f.read())
+            self.digests = set(digests)
+        else:
+            self.digests = self._from_database()
+            logger.info(f"Seeded seen URLs for {self.site} with {len(self.digests)} jobs from the database")
+        self.loaded = True
+        return self
+
+    def _from_database(self):
+        from job_recommendation.models import Job
+
+        urls = Job.objects.filter(source=self.site).values_list('url', flat=True).iterator(chunk_size=2000)
+        return {digest for digest in map(url_digest, urls) if digest is not None}
+
+    def __contains__(self, url):
+        return url_digest(url) in self.digests
+
+    def __len__(self):
+        return len(self.digests)
+
+    def new_jobs(self, jobs):
+        """The jobs whose URL has not been seen (jobs without a URL are dropped)."""
+        return [job for job in jobs if job.get('url') and job['url'] not in self]
+
+    def add(self, urls):
+        self.digests.update(digest for digest in map(url_digest, urls) if digest is not None)
+
+    def save(self):
+        if not self.persist:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            array('Q', sorted(self.digests)).tofile(f)
+        os.replace(tmp_path, self.path)
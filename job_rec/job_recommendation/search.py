@@ -0,0 +1,38 @@
+"""
+Full-text job search over jobs_cleaned.
+
+JobCleaned.search_vector is a generated tsvector of title (weight A), company
+(B) and description (C), indexed with GIN, so a search is an index lookup
+instead of ILIKE scans over every description. Every word of the query must
+match, the last one as a prefix so as-you-type queries ("data anal") already
+find "data analyst". Results are ordered by SearchRank, newest first on ties.
+"""
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F
+
+CONFIG = 'english'
+
+_WORD = re.compile(r'\w+')
+
+
+def to_tsquery(text):
+    """Raw tsquery for text: every word must match, the last one as a prefix. None if text has no words."""
+    words = _WORD.findall(text.lower())
+    if not words:
+        return None
+    return ' & '.join(words[:-1] + [f'{words[-1]}:*'])
+
+
+def search_jobs(jobs, text):
+    """Filter the JobCleaned queryset jobs by text, best matches first."""
+    tsquery = to_tsquery(text)
+    if tsquery is None:
+        return jobs.none()
+    query = SearchQuery(tsquery, search_type='raw', config=CONFIG)
+    return (
+        jobs.filter(search_vector=query)
+        .annotate(rank=SearchRank(F('search_vector'), query))
+        .order_by('-rank', '-date_posted', '-id')
+    )
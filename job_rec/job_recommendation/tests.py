@@ -1,3 +1,242 @@
-from django.test import TestCase
+import asyncio
+import os
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.core.cache import cache, caches
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from job_recommendation import page_cache
+from job_recommendation.model import prediction_cache
+from job_recommendation.model2_reccomender.job_index import IVFIndex, JobIndex
+from job_recommendation.scraper.browser_pool import BrowserPool
+from job_recommendation.scraper.fetchers import FallbackFetcher, FixtureFetcher, HttpFetcher, has_class
+from job_recommendation.scraper.parser_specs import SITE_SPECS, available_backends, compile_spec
+from job_recommendation.scraper.response_cache import ResponseCache
+from job_recommendation.scraper.run_scrapers import SCRAPERS, run_scraper
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'scraper', 'fixtures')
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+class FakeResponse:
+    def __init__(self, status_code, text='', headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+
+class NotReadyPageTests(SimpleTestCase):
+    """A listing page that only renders with JS must never be reported as unchanged."""
+
+    def setUp(self):
+        self.shell = read_fixture('not_ready_page.html')
+        self.rendered = read_fixture('ntchito_final_page_source.html')
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        ready = has_class('post', 'job-listing', 'job')
+        self.http = HttpFetcher('ntchito.com', cache=ResponseCache(cache_dir.name), ready=ready)
+        self.fetcher = FallbackFetcher(
+            self.http, FixtureFetcher('ntchito.com', FIXTURE_DIR, default='ntchito_final_page_source.html'), ready
+        )
+
+    def get(self, url, timeout=None, headers=None):
+        # The server answers conditional requests for the static shell with 304
+        if headers and headers.get('If-None-Match') == '"shell"':
+            return FakeResponse(304)
+        return FakeResponse(200, self.shell, {'ETag': '"shell"'})
+
+    async def fetch_and_commit(self, url):
+        html = await self.fetcher.fetch(url)
+        await self.fetcher.commit()
+        return html
+
+    def test_not_ready_page_is_rendered_on_every_fetch(self):
+        url = 'https://ntchito.com/jobs/'
+        with mock.patch.object(self.http.session, 'get', side_effect=self.get):
+            first = asyncio.run(self.fetch_and_commit(url))
+            second = asyncio.run(self.fetch_and_commit(url))
+        self.assertEqual(first, self.rendered)
+        self.assertEqual(second, self.rendered)
+        self.assertIsNone(self.http.cache.get(url))
+
+    def test_stale_not_ready_cache_entry_is_not_unchanged(self):
+        url = 'https://ntchito.com/jobs/'
+        # Entry left by a version that committed pages before checking them
+        self.http.cache.put(url, self.shell, etag='"shell"')
+        with mock.patch.object(self.http.session, 'get', side_effect=self.get):
+            self.assertEqual(asyncio.run(self.fetch_and_commit(url)), self.rendered)
+
+
+class BrowserPoolCloseTests(SimpleTestCase):
+    """Closing a pool must not leak drivers that are still leased."""
+
+    def setUp(self):
+        self.pool = BrowserPool(size=2, max_pages=10)
+        self.pool._start = mock.Mock(side_effect=lambda: mock.Mock(name='driver'))
+
+    def test_driver_leased_during_close_is_quit_on_release(self):
+        with self.pool.lease() as driver:
+            self.pool.close()
+            driver.quit.assert_not_called()
+        driver.quit.assert_called_once()
+        self.assertEqual(self.pool.pages, {})
+        self.assertTrue(self.pool.idle.empty())
+
+    def test_closed_pool_starts_no_drivers(self):
+        self.pool.close()
+        with self.assertRaises(RuntimeError):
+            with self.pool.lease():
+                pass
+        self.pool._start.assert_not_called()
+
+
+class ParserBackendTests(SimpleTestCase):
+    def test_page_with_xml_declaration(self):
+        html = '<?xml version="1.0" encoding="iso-8859-1"?>\n' + read_fixture('ntchito_final_page_source.html')
+        expected = compile_spec(SITE_SPECS['ntchito.com'], 'html.parser').extract(html)
+        self.assertTrue(expected)
+        for backend in available_backends():
+            with self.subTest(backend=backend):
+                self.assertEqual(compile_spec(SITE_SPECS['ntchito.com'], backend).extract(html), expected)
+
+
+class SiteFixtureTests(SimpleTestCase):
+    """Each scraper parses its saved listing page into the expected jobs."""
+
+    FIELDS = ('title', 'url', 'company', 'location', 'job_type')
+    EXPECTED = {
+        'ntchito.com': [
+            ('Accountant', 'https://ntchito.com/job/accountant-blantyre/', 'ACME Ltd', 'Blantyre', 'Full Time'),
+            ('Registered Nurse', 'https://ntchito.com/job/registered-nurse/', 'N/A', 'Lilongwe', 'N/A'),
+        ],
+        'jobsearchmalawi.com': [
+            ('Finance Officer', 'https://jobsearchmalawi.com/job/finance-officer-lilongwe/',
+             'Malawi Revenue Authority', 'Lilongwe', 'Full Time'),
+            ('Driver', 'https://jobsearchmalawi.com/job/driver-mzuzu/?utm_source=home', 'N/A', 'Mzuzu', 'N/A'),
+        ],
+        'careersmw.com': [
+            ('Software Developer', 'https://careersmw.com/jobs/software-developer-blantyre/',
+             'Airtel Malawi', 'Blantyre', 'Contract'),
+            ('Monitoring & Evaluation Officer', 'https://careersmw.com/jobs/monitoring-and-evaluation-officer/',
+             'World Vision', 'Zomba', 'Full Time'),
+        ],
+    }
+
+    def test_every_site_has_a_fixture(self):
+        self.assertEqual(set(self.EXPECTED), set(SCRAPERS))
+
+    def test_fixture_pages_parse_to_expected_jobs(self):
+        for site, expected in self.EXPECTED.items():
+            with self.subTest(site=site):
+                fetcher = FixtureFetcher(site, FIXTURE_DIR, default=f"{site.split('.')[0]}_final_page_source.html")
+                jobs = asyncio.run(SCRAPERS[site](fetcher=fetcher, save=False))
+                self.assertEqual([tuple(job[name] for name in self.FIELDS) for job in jobs], expected)
+                for job in jobs:
+                    self.assertEqual((job['source'], job['description']), (site, 'N/A'))
+
+    def test_scraper_errors_are_reported_as_failed(self):
+        for site, scraper in SCRAPERS.items():
+            with self.subTest(site=site):
+                fetcher = FixtureFetcher(site, os.path.join(FIXTURE_DIR, 'missing'))
+                jobs, report = asyncio.run(run_scraper(site, lambda: scraper(fetcher=fetcher, save=False), 10))
+                self.assertEqual((jobs, report['status']), ([], 'failed'))
+
+
+@override_settings(
+    CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'page-cache-tests',
+            'OPTIONS': {'MAX_ENTRIES': 3, 'CULL_FREQUENCY': 1},
+        },
+        'page_cache_meta': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'page-cache-tests-meta',
+        },
+    },
+    PAGE_CACHE_TTL=600,
+)
+class PageCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        caches[page_cache.META_CACHE].clear()
+        self.rendered = 0
+
+        @page_cache.cache_jobs_page(params=('category',))
+        def listing(request):
+            self.rendered += 1
+            return HttpResponse(f'render {self.rendered}')
+
+        self.view = listing
+        self.addCleanup(page_cache.CACHED_VIEWS.remove, 'listing')
+        self.factory = RequestFactory()
+
+    def test_version_and_counters_survive_culling(self):
+        version = page_cache.data_version()
+        for i in range(10):
+            self.view(self.factory.get('/jobs/', {'category': f'c{i}'}))
+            cache.set(f'filler-{i}', i)
+        self.assertEqual(page_cache.data_version(), version)
+        self.assertEqual(page_cache.stats(['listing'])['listing']['misses'], 10)
+
+    def test_only_allowed_query_parameters_are_cached(self):
+        self.view(self.factory.get('/jobs/', {'category': 'IT'}))
+        self.assertEqual(self.view(self.factory.get('/jobs/', {'category': 'IT'}))['X-Page-Cache'], 'hit')
+        for query in ({'q': 'nurse'}, {'after': '2026-10-01.5'}, {'category': 'IT', 'page': '2'}):
+            with self.subTest(query=query):
+                self.view(self.factory.get('/jobs/', query))
+                response = self.view(self.factory.get('/jobs/', query))
+                self.assertFalse(response.has_header('X-Page-Cache'))
+        self.assertEqual(self.rendered, 7)
+
+
+class JobIndexTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'job_index.npz')
+
+    def test_empty_ivf_index_round_trips(self):
+        IVFIndex().save(self.path)
+        index = JobIndex.load(self.path)
+        self.assertEqual(len(index), 0)
+        index.add([1, 2], np.eye(2, 8))
+        self.assertEqual(index.search(np.eye(1, 8), 1)[0][0], 1)
+
+    def test_ivf_index_needs_rebuild_once_it_outgrows_its_lists(self):
+        rng = np.random.default_rng(0)
+        index = IVFIndex()
+        index.add(range(4), rng.standard_normal((4, 8)))
+        self.assertFalse(index.needs_rebuild())
+        index.add(range(4, 16), rng.standard_normal((12, 8)))
+        index.save(self.path)
+        self.assertTrue(JobIndex.load(self.path).needs_rebuild())
+
+
+@override_settings(PREDICTION_CACHE_SHARED=False, PREDICTION_CACHE_LOG_EVERY=3)
+class PredictionCacheTests(SimpleTestCase):
+    def setUp(self):
+        prediction_cache.clear()
+        self.addCleanup(prediction_cache.clear)
+        patcher = mock.patch.dict(prediction_cache._stats, {'local_hits': 0, 'shared_hits': 0, 'misses': 0})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_counters_are_logged_every_n_lookups(self):
+        predict = mock.Mock(return_value=('IT & Innovation', [0.1]))
+        with self.assertLogs(prediction_cache.logger, 'INFO') as logs:
+            for text in ('Python developer', 'python  developer', 'Nurse'):
+                prediction_cache.get_or_predict(text, predict, 'torch')
+        self.assertEqual(predict.call_count, 2)
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn('1 local hits, 0 shared hits, 2 misses (33.3% hit ratio), 2 entries', logs.output[0])
@@ -12,9 +12,12 @@ from django.contrib.auth.forms import AuthenticationForm
 from django.contrib.auth.hashers import check_password, make_password
 from django.contrib.sessions.backends.db import SessionStore
 from django.core.paginator import Paginator
-from django.db.models import Q
 from job_recommendation.model.recommender import recommend_category
-from django.db import models
+from job_recommendation.search import search_jobs
+from job_recommendation.display import job_icon
+from job_recommendation.listing import PER_PAGE, card_queryset, decorate, keyset_page, newest_jobs
+from job_recommendation.category_overview import get_category_overview
+from job_recommendation.page_cache import bump_data_version, cache_jobs_page
 
 
 # Define categories and keywords for grouping
@@ -34,38 +37,20 @@ CATEGORY_KEYWORDS = {
     "Creative & Media": ["graphic", "media", "journalist", "video", "design"],
 }
 
+@cache_jobs_page
 def home(request):
     from job_recommendation.models import JobCleaned
-    # Get all unique categories from jobs_cleaned and their job counts
-    categories = JobCleaned.objects.values('category').annotate(count=models.Count('id')).order_by('-count')[:6]
-    category_data = []
-    for cat in categories:
-        icon = get_job_icon('', cat['category'])
-        category_data.append({'name': cat['category'], 'icon': icon, 'count': cat['count']})
-    jobs = JobCleaned.objects.all()
-    for job in jobs:
-        job.icon_class = get_job_icon(job.title, getattr(job, 'category', None))
+    # Passed as callables so they are only queried when their cached
+    # template fragments are missing: the six largest categories with their
+    # job counts, and the six newest jobs
     return render(request, 'job_recommendation/index.html', {
-        'jobs': jobs,
-        'category_data': category_data
+        'jobs': lambda: newest_jobs(JobCleaned.objects.all(), 6),
+        'category_data': lambda: get_category_overview()[:6],
     })
 
     
 
-def category_icon(category):
-    icons = {
-        "Agriculture & Environment": "fa-seedling",
-        "Health & Education": "fa-stethoscope",
-        "Business & Administration": "fa-briefcase",
-        "Technical & Engineering": "fa-cogs",
-        "IT & Innovation": "fa-laptop-code",
-        "Services & Informal Sector": "fa-tools",
-        "Government & NGOs": "fa-university",
-        "Creative & Media": "fa-paint-brush",
-    }
-    return icons.get(category, "fa-briefcase")
-
-
+@cache_jobs_page
 def job_detail(request, job_id):
     job = Job.objects.get(id=job_id)
     return render(request, 'job_recommendation/job-detail.html', {'job': job})
@@ -81,107 +66,33 @@ def create_profile(request):
         form = ProfileForm(request.POST)
         if form.is_valid():
             user = form.save()
-            # Run matching for the new user so matches are available on first login
-            from job_recommendation.model2_reccomender.eish import save_matches_to_db
-            save_matches_to_db(user.id, top_n=6)
+            # Queue matching for the new user; the process_match_queue worker fills them in
+            from job_recommendation.model2_reccomender.refresh_queue import enqueue_match_refresh
+            enqueue_match_refresh(user.id)
             messages.success(request, 'Profile created successfully! Please login.')
             return redirect('login')
     else:
         form = ProfileForm()
     return render(request, 'job_recommendation/create_profile.html', {'form': form})
 
-def get_job_icon(job_title, job_category=None):
-    """
-    Determine the appropriate icon for a job based on title or category
-    """
-    title_lower = job_title.lower()
-    
-    # Technology/IT jobs
-    if any(word in title_lower for word in ['developer', 'programmer', 'software', 'engineer', 'coding', 'web', 'app', 'mobile', 'frontend', 'backend', 'fullstack', 'devops', 'data', 'ai', 'machine learning']):
-        return 'fa-laptop-code'
-    
-    # Design/Creative jobs
-    elif any(word in title_lower for word in ['designer', 'design', 'creative', 'graphic', 'ui', 'ux', 'art', 'visual', 'illustrator', 'animator']):
-        return 'fa-paint-brush'
-    
-    # Marketing/Sales jobs
-    elif any(word in title_lower for word in ['marketing', 'sales', 'business', 'account', 'manager', 'executive', 'representative', 'consultant']):
-        return 'fa-chart-line'
-    
-    # Healthcare jobs
-    elif any(word in title_lower for word in ['nurse', 'doctor', 'medical', 'health', 'care', 'therapist', 'physician', 'dentist', 'pharmacist']):
-        return 'fa-stethoscope'
-    
-    # Education jobs
-    elif any(word in title_lower for word in ['teacher', 'professor', 'instructor', 'educator', 'tutor', 'lecturer', 'academic']):
-        return 'fa-graduation-cap'
-    
-    # Finance/Accounting jobs
-    elif any(word in title_lower for word in ['accountant', 'finance', 'financial', 'banking', 'auditor', 'bookkeeper', 'analyst']):
-        return 'fa-calculator'
-    
-    # Customer Service jobs
-    elif any(word in title_lower for word in ['customer', 'support', 'service', 'representative', 'assistant', 'help', 'care']):
-        return 'fa-headset'
-    
-    # Engineering/Technical jobs
-    elif any(word in title_lower for word in ['engineer', 'technical', 'technician', 'mechanic', 'electrician', 'plumber', 'construction']):
-        return 'fa-cogs'
-    
-    # Administrative jobs
-    elif any(word in title_lower for word in ['admin', 'administrative', 'secretary', 'assistant', 'coordinator', 'clerk']):
-        return 'fa-briefcase'
-    
-    # Legal jobs
-    elif any(word in title_lower for word in ['lawyer', 'attorney', 'legal', 'paralegal', 'law']):
-        return 'fa-balance-scale'
-    
-    # Science/Research jobs
-    elif any(word in title_lower for word in ['scientist', 'researcher', 'analyst', 'laboratory', 'research', 'phd']):
-        return 'fa-flask'
-    
-    # Transportation/Logistics jobs
-    elif any(word in title_lower for word in ['driver', 'delivery', 'logistics', 'transport', 'shipping', 'warehouse']):
-        return 'fa-truck'
-    
-    # Hospitality/Tourism jobs
-    elif any(word in title_lower for word in ['hotel', 'restaurant', 'chef', 'cook', 'waiter', 'tourism', 'travel']):
-        return 'fa-utensils'
-    
-    # Media/Entertainment jobs
-    elif any(word in title_lower for word in ['journalist', 'reporter', 'writer', 'editor', 'media', 'entertainment', 'actor', 'musician']):
-        return 'fa-microphone'
-    
-    # Government/Public Service jobs
-    elif any(word in title_lower for word in ['government', 'public', 'officer', 'policy', 'civil', 'service']):
-        return 'fa-university'
-    
-    # Agriculture/Environment jobs
-    elif any(word in title_lower for word in ['agriculture', 'farming', 'environment', 'conservation', 'forestry']):
-        return 'fa-seedling'
-    
-    # Default icon for other jobs
-    else:
-        return 'fa-briefcase'
-
+@cache_jobs_page(params=('category',))
 def job_list(request):
     query = request.GET.get('q', '')
     category = request.GET.get('category', '')
     from job_recommendation.models import JobCleaned
     jobs = JobCleaned.objects.all()
     if query:
-        jobs = jobs.filter(
-            Q(title__icontains=query) |
-            Q(company__icontains=query) |
-            Q(description__icontains=query)
-        )
+        jobs = search_jobs(jobs, query)
     if category:
         jobs = jobs.filter(category__iexact=category)
-    for job in jobs:
-        job.icon_class = get_job_icon(job.title, getattr(job, 'category', None))
-    paginator = Paginator(jobs, 6)  # Show 6 jobs per page
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    if query:
+        # Ranked search results are paged by number
+        paginator = Paginator(card_queryset(jobs), PER_PAGE)
+        page_obj = paginator.get_page(request.GET.get('page'))
+        decorate(page_obj.object_list)
+    else:
+        # Browsing pages by (date_posted, id) cursors, newest first
+        page_obj = keyset_page(jobs, after=request.GET.get('after'), before=request.GET.get('before'))
     return render(request, 'job_recommendation/job-list.html', {
         'page_obj': page_obj,
         'jobs': page_obj,
@@ -189,22 +100,10 @@ def job_list(request):
         'selected_category': category,
     })
 
+@cache_jobs_page
 def category(request):
-    from job_recommendation.models import JobCleaned
-    # Get all unique categories from jobs_cleaned
-    categories = JobCleaned.objects.values_list('category', flat=True).distinct()
-    # For each category, get jobs in that category
-    category_jobs = []
-    for cat in categories:
-        jobs = JobCleaned.objects.filter(category=cat)
-        for job in jobs:
-            job.icon_class = get_job_icon(job.title, getattr(job, 'category', None))
-        category_jobs.append({
-            'name': cat,
-            'jobs': jobs,
-            'count': jobs.count(),
-            'icon': get_job_icon('', cat)
-        })
+    # Every category with its job count and newest jobs, from one cached query
+    category_jobs = get_category_overview()
     return render(request, 'job_recommendation/category.html', {
         'category_jobs': category_jobs
     })
@@ -245,15 +144,14 @@ def profile_view(request):
     
     user = User.objects.get(id=request.session['user_id'])
     from job_recommendation.models import MatchedJob, JobCleaned
+    from job_recommendation.model2_reccomender.refresh_queue import is_refresh_pending
     # Get matched job IDs for this user, ordered by similarity
     matched = MatchedJob.objects.filter(user_id=user.id).order_by('-similarity_score')[:6]
     job_ids = [m.job_id for m in matched]
     # Get jobs from JobCleaned with those IDs
-    jobs = list(JobCleaned.objects.filter(id__in=job_ids))
+    jobs = list(card_queryset(JobCleaned.objects.filter(id__in=job_ids)))
     # Sort jobs to match the order of job_ids
-    jobs = sorted(jobs, key=lambda job: job_ids.index(job.id))
-    for job in jobs:
-        job.icon_class = get_job_icon(job.title, getattr(job, 'category', None))
+    jobs = decorate(sorted(jobs, key=lambda job: job_ids.index(job.id)))
     category_data = [
         {'name': 'Design & Creative', 'icon': 'fa-paint-brush', 'count': 100},
         {'name': 'Marketing & Sales', 'icon': 'fa-chart-line', 'count': 150},
@@ -263,7 +161,8 @@ def profile_view(request):
     return render(request, 'job_recommendation/profile.html', {
         'user': user,
         'jobs': jobs,
-        'category_data': category_data
+        'category_data': category_data,
+        'refreshing': is_refresh_pending(user.id)
     })
 
 def logout_view(request):
@@ -275,7 +174,10 @@ def post_job(request):
     if request.method == 'POST':
         form = JobCleanedForm(request.POST)
         if form.is_valid():
-            form.save()
+            job = form.save(commit=False)
+            job.icon = job_icon(job.title)
+            job.save()
+            bump_data_version()
             return redirect('job-list')
     else:
         form = JobCleanedForm()
@@ -328,18 +230,33 @@ def update_profile(request):
         return redirect('login')
     user = User.objects.get(id=request.session['user_id'])
     if request.method == 'POST':
+        # Read before the form copies the new values onto user
+        old_profile_text = profile_text(user)
         form = ProfileUpdateForm(request.POST, instance=user)
         if form.is_valid():
             form.save()
-            # Refresh job recommendations for this user
-            from job_recommendation.model2_reccomender.eish import save_matches_to_db
-            save_matches_to_db(user.id, top_n=6)
+            from job_recommendation.model import prediction_cache
+            prediction_cache.invalidate(old_profile_text)
+            # Queue a refresh of job recommendations for this user
+            from job_recommendation.model2_reccomender.refresh_queue import enqueue_match_refresh
+            enqueue_match_refresh(user.id)
             messages.success(request, 'Profile updated successfully!')
             return redirect('profile')
     else:
         form = ProfileUpdateForm(instance=user)
     return render(request, 'job_recommendation/update_profile.html', {'form': form})
 
+def profile_text(user):
+    """Concatenate the profile fields recommend_job classifies."""
+    profile_fields = [
+        user.name,
+        user.academic_qualification,
+        user.experience,
+        ', '.join(user.skills) if hasattr(user, 'skills') else '',
+        user.about
+    ]
+    return ' '.join([str(f) for f in profile_fields if f])
+
 def recommend_job(request):
     jobs = None
     category = None
@@ -347,15 +264,7 @@ def recommend_job(request):
     profile_used = False
     if 'user_id' in request.session:
         user = User.objects.get(id=request.session['user_id'])
-        # Combine relevant profile fields
-        profile_fields = [
-            user.name,
-            user.academic_qualification,
-            user.experience,
-            ', '.join(user.skills) if hasattr(user, 'skills') else '',
-            user.about
-        ]
-        user_input = ' '.join([str(f) for f in profile_fields if f])
+        user_input = profile_text(user)
         profile_used = True
         if user_input:
             category = recommend_category(user_input)
@@ -11,5 +11,8 @@ python manage.py migrate
 # collect static files
 python manage.py collectstatic --noinput
 
+# start the match refresh worker in the background
+python manage.py process_match_queue &
+
 # start the gunicorn server
 gunicorn job_rec.wsgi:application --workers 1 --bind 0.0.0.0:$PORT --timeout 120
\ No newline at end of file